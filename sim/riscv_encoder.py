@@ -45,103 +45,133 @@ def encode_j_type(imm21, rd, opcode=0b1101111):
     insn = (imm_20 << 31) | (imm_19_12 << 12) | (imm_11 << 20) | (imm_10_1 << 21) | (rd << 7) | opcode
     return insn
 
+# Constant (funct7/funct3/opcode) part of each fixed-format encoding,
+# precomputed so the mnemonic helpers below are a single OR chain.
+_ADD   = (0b0000000 << 25) | (0b000 << 12) | 0b0110011
+_SUB   = (0b0100000 << 25) | (0b000 << 12) | 0b0110011
+_AND   = (0b0000000 << 25) | (0b111 << 12) | 0b0110011
+_OR    = (0b0000000 << 25) | (0b110 << 12) | 0b0110011
+_XOR   = (0b0000000 << 25) | (0b100 << 12) | 0b0110011
+_SLL   = (0b0000000 << 25) | (0b001 << 12) | 0b0110011
+_SRL   = (0b0000000 << 25) | (0b101 << 12) | 0b0110011
+_SRA   = (0b0100000 << 25) | (0b101 << 12) | 0b0110011
+_SLT   = (0b0000000 << 25) | (0b010 << 12) | 0b0110011
+_SLTU  = (0b0000000 << 25) | (0b011 << 12) | 0b0110011
+_ADDI  = (0b000 << 12) | 0b0010011
+_SLTI  = (0b010 << 12) | 0b0010011
+_SLTIU = (0b011 << 12) | 0b0010011
+_XORI  = (0b100 << 12) | 0b0010011
+_ORI   = (0b110 << 12) | 0b0010011
+_ANDI  = (0b111 << 12) | 0b0010011
+_SLLI  = (0b001 << 12) | 0b0010011
+_SRLI  = (0b101 << 12) | 0b0010011
+_SRAI  = (0x400 << 20) | (0b101 << 12) | 0b0010011
+_LUI   = 0b0110111
+_AUIPC = 0b0010111
+_LB    = (0b000 << 12) | 0b0000011
+_LH    = (0b001 << 12) | 0b0000011
+_LW    = (0b010 << 12) | 0b0000011
+_LBU   = (0b100 << 12) | 0b0000011
+_LHU   = (0b101 << 12) | 0b0000011
+_JALR  = (0b000 << 12) | 0b1100111
+
 # Specific instruction encoders
 def ADD(rd, rs1, rs2):
-    return encode_r_type(0b0000000, rs2, rs1, 0b000, rd)
+    return _ADD | (rs2 << 20) | (rs1 << 15) | (rd << 7)
 
 def SUB(rd, rs1, rs2):
-    return encode_r_type(0b0100000, rs2, rs1, 0b000, rd)
+    return _SUB | (rs2 << 20) | (rs1 << 15) | (rd << 7)
 
 def AND(rd, rs1, rs2):
-    return encode_r_type(0b0000000, rs2, rs1, 0b111, rd)
+    return _AND | (rs2 << 20) | (rs1 << 15) | (rd << 7)
 
 def OR(rd, rs1, rs2):
-    return encode_r_type(0b0000000, rs2, rs1, 0b110, rd)
+    return _OR | (rs2 << 20) | (rs1 << 15) | (rd << 7)
 
 def XOR(rd, rs1, rs2):
-    return encode_r_type(0b0000000, rs2, rs1, 0b100, rd)
+    return _XOR | (rs2 << 20) | (rs1 << 15) | (rd << 7)
 
 def SLL(rd, rs1, rs2):
-    return encode_r_type(0b0000000, rs2, rs1, 0b001, rd)
+    return _SLL | (rs2 << 20) | (rs1 << 15) | (rd << 7)
 
 def SRL(rd, rs1, rs2):
-    return encode_r_type(0b0000000, rs2, rs1, 0b101, rd)
+    return _SRL | (rs2 << 20) | (rs1 << 15) | (rd << 7)
 
 def SRA(rd, rs1, rs2):
-    return encode_r_type(0b0100000, rs2, rs1, 0b101, rd)
+    return _SRA | (rs2 << 20) | (rs1 << 15) | (rd << 7)
 
 def SLT(rd, rs1, rs2):
-    return encode_r_type(0b0000000, rs2, rs1, 0b010, rd)
+    return _SLT | (rs2 << 20) | (rs1 << 15) | (rd << 7)
 
 def SLTU(rd, rs1, rs2):
-    return encode_r_type(0b0000000, rs2, rs1, 0b011, rd)
+    return _SLTU | (rs2 << 20) | (rs1 << 15) | (rd << 7)
 
 # I-type arithmetic instructions
 def ADDI(rd, rs1, imm12):
     """ADDI rd, rs1, imm12"""
-    return encode_i_type(imm12, rs1, 0b000, rd, 0b0010011)
+    return _ADDI | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 def SLTI(rd, rs1, imm12):
     """SLTI rd, rs1, imm12"""
-    return encode_i_type(imm12, rs1, 0b010, rd, 0b0010011)
+    return _SLTI | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 def SLTIU(rd, rs1, imm12):
     """SLTIU rd, rs1, imm12"""
-    return encode_i_type(imm12, rs1, 0b011, rd, 0b0010011)
+    return _SLTIU | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 def XORI(rd, rs1, imm12):
     """XORI rd, rs1, imm12"""
-    return encode_i_type(imm12, rs1, 0b100, rd, 0b0010011)
+    return _XORI | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 def ORI(rd, rs1, imm12):
     """ORI rd, rs1, imm12"""
-    return encode_i_type(imm12, rs1, 0b110, rd, 0b0010011)
+    return _ORI | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 def ANDI(rd, rs1, imm12):
     """ANDI rd, rs1, imm12"""
-    return encode_i_type(imm12, rs1, 0b111, rd, 0b0010011)
+    return _ANDI | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 def SLLI(rd, rs1, shamt):
     """SLLI rd, rs1, shamt (shamt is 5-bit)"""
-    return encode_i_type(shamt & 0x1F, rs1, 0b001, rd, 0b0010011)
+    return _SLLI | ((shamt & 0x1F) << 20) | (rs1 << 15) | (rd << 7)
 
 def SRLI(rd, rs1, shamt):
     """SRLI rd, rs1, shamt (shamt is 5-bit)"""
-    return encode_i_type(shamt & 0x1F, rs1, 0b101, rd, 0b0010011)
+    return _SRLI | ((shamt & 0x1F) << 20) | (rs1 << 15) | (rd << 7)
 
 def SRAI(rd, rs1, shamt):
     """SRAI rd, rs1, shamt (shamt is 5-bit with bit[10]=1)"""
-    return encode_i_type(0x400 | (shamt & 0x1F), rs1, 0b101, rd, 0b0010011)
+    return _SRAI | ((shamt & 0x1F) << 20) | (rs1 << 15) | (rd << 7)
 
 # Upper immediate instructions
 def LUI(rd, imm20):
     """LUI rd, imm20"""
-    return encode_u_type(imm20, rd, 0b0110111)
+    return _LUI | ((imm20 & 0xFFFFF) << 12) | (rd << 7)
 
 def AUIPC(rd, imm20):
     """AUIPC rd, imm20"""
-    return encode_u_type(imm20, rd, 0b0010111)
+    return _AUIPC | ((imm20 & 0xFFFFF) << 12) | (rd << 7)
 
 # Load instructions (I-type, opcode=0b0000011)
 def LB(rd, rs1, imm12):
     """LB rd, imm12(rs1) - Load byte (sign-extended)"""
-    return encode_i_type(imm12, rs1, 0b000, rd, 0b0000011)
+    return _LB | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 def LH(rd, rs1, imm12):
     """LH rd, imm12(rs1) - Load halfword (sign-extended)"""
-    return encode_i_type(imm12, rs1, 0b001, rd, 0b0000011)
+    return _LH | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 def LW(rd, rs1, imm12):
     """LW rd, imm12(rs1) - Load word"""
-    return encode_i_type(imm12, rs1, 0b010, rd, 0b0000011)
+    return _LW | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 def LBU(rd, rs1, imm12):
     """LBU rd, imm12(rs1) - Load byte unsigned"""
-    return encode_i_type(imm12, rs1, 0b100, rd, 0b0000011)
+    return _LBU | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 def LHU(rd, rs1, imm12):
     """LHU rd, imm12(rs1) - Load halfword unsigned"""
-    return encode_i_type(imm12, rs1, 0b101, rd, 0b0000011)
+    return _LHU | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 # Store instructions (S-type, opcode=0b0100011)
 def SB(rs2, rs1, imm12):
@@ -188,7 +218,7 @@ def JAL(rd, imm21):
 
 def JALR(rd, rs1, imm12):
     """JALR rd, rs1, imm12 - Jump and link register"""
-    return encode_i_type(imm12, rs1, 0b000, rd, 0b1100111)
+    return _JALR | ((imm12 & 0xFFF) << 20) | (rs1 << 15) | (rd << 7)
 
 # Print test cases for verification
 if __name__ == "__main__":
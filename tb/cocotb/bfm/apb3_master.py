@@ -6,7 +6,8 @@ Used for CPU debug interface access per MEMORY_MAP.md.
 """
 
 import cocotb
-from cocotb.triggers import RisingEdge
+from cocotb.handle import Immediate
+from cocotb.triggers import ClockCycles, First, RisingEdge
 from typing import Optional
 
 
@@ -22,7 +23,14 @@ class APB3Master:
     - Simple two-cycle protocol (SETUP, ACCESS)
     """
 
-    def __init__(self, dut, name, clock, reset=None):
+    # Handles are read every cycle; slots avoid a per-instance __dict__
+    __slots__ = (
+        "dut", "clock", "reset", "timeout_cycles", "_clock_edge",
+        "paddr", "psel", "penable", "pwrite", "pwdata",
+        "prdata", "pready", "pslverr",
+    )
+
+    def __init__(self, dut, name, clock, reset=None, timeout_cycles: int = 1000):
         """
         Initialize APB3 master.
 
@@ -31,10 +39,14 @@ class APB3Master:
             name: Prefix for signal names (e.g., 'apb_')
             clock: Clock signal
             reset: Reset signal (optional)
+            timeout_cycles: Maximum wait states before a transfer times out
         """
         self.dut = dut
         self.clock = clock
+        # One trigger object reused for every clock-edge await
+        self._clock_edge = RisingEdge(clock)
         self.reset = reset
+        self.timeout_cycles = timeout_cycles
 
         # APB3 signals
         self.paddr = getattr(dut, f"{name}paddr")
@@ -50,12 +62,46 @@ class APB3Master:
         self._init_signals()
 
     def _init_signals(self):
-        """Initialize all master outputs to idle state."""
-        self.paddr.value = 0
-        self.psel.value = 0
-        self.penable.value = 0
-        self.pwrite.value = 0
-        self.pwdata.value = 0
+        """
+        Initialize all master outputs to idle state.
+
+        Only called at construction or while reset is asserted, so the
+        values are applied immediately rather than scheduled as inertial
+        writes.
+        """
+        self.paddr.value = Immediate(0)
+        self.psel.value = Immediate(0)
+        self.penable.value = Immediate(0)
+        self.pwrite.value = Immediate(0)
+        self.pwdata.value = Immediate(0)
+
+    async def _wait_ready(self):
+        """
+        Complete the ACCESS phase on the first clock edge with PREADY high.
+
+        If the slave inserts wait states, sleep on PREADY itself instead of
+        waking up every clock cycle.
+
+        Raises:
+            TimeoutError: If PREADY is not asserted within timeout_cycles
+        """
+        await self._clock_edge
+        if not self.pready.value:
+            await self._wait_stalled()
+
+    async def _wait_stalled(self):
+        """
+        Finish an ACCESS phase that the slave is stretching with PREADY low.
+
+        Split out of _wait_ready() so the burst loops can inline the
+        zero-wait-state check and only pay for a coroutine call on a stall.
+        """
+        timeout = ClockCycles(self.clock, self.timeout_cycles)
+        if await First(RisingEdge(self.pready), timeout) is timeout:
+            raise TimeoutError(
+                f"APB slave did not assert pready within {self.timeout_cycles} cycles"
+            )
+        await self._clock_edge
 
     async def write(self, addr: int, data: int) -> bool:
         """
@@ -68,21 +114,19 @@ class APB3Master:
         Returns:
             True if successful, False if slave error
         """
-        # SETUP phase
+        # SETUP phase (PENABLE is already low in IDLE)
         self.paddr.value = addr
         self.psel.value = 1
         self.pwrite.value = 1
         self.pwdata.value = data
-        self.penable.value = 0
 
-        await RisingEdge(self.clock)
+        await self._clock_edge
 
         # ACCESS phase
         self.penable.value = 1
 
         # Wait for pready
-        while not self.pready.value:
-            await RisingEdge(self.clock)
+        await self._wait_ready()
 
         # Check for slave error
         error = bool(self.pslverr.value)
@@ -92,7 +136,7 @@ class APB3Master:
         self.penable.value = 0
         self.pwrite.value = 0
 
-        await RisingEdge(self.clock)
+        await self._clock_edge
 
         return not error
 
@@ -108,20 +152,17 @@ class APB3Master:
             - data: 32-bit read data
             - success: True if successful, False if slave error
         """
-        # SETUP phase
+        # SETUP phase (PENABLE and PWRITE are already low in IDLE)
         self.paddr.value = addr
         self.psel.value = 1
-        self.pwrite.value = 0
-        self.penable.value = 0
 
-        await RisingEdge(self.clock)
+        await self._clock_edge
 
         # ACCESS phase
         self.penable.value = 1
 
         # Wait for pready
-        while not self.pready.value:
-            await RisingEdge(self.clock)
+        await self._wait_ready()
 
         # Sample data and error
         data = int(self.prdata.value)
@@ -131,7 +172,155 @@ class APB3Master:
         self.psel.value = 0
         self.penable.value = 0
 
-        await RisingEdge(self.clock)
+        await self._clock_edge
+
+        return (data, not error)
+
+    async def read_burst(self, addrs: list[int]) -> list[tuple[int, bool]]:
+        """
+        Perform back-to-back APB3 reads without returning to IDLE.
+
+        PSEL stays asserted between transfers (APB3 SETUP -> ACCESS -> SETUP
+        sequence), so each read costs two clock cycles instead of three.
+
+        Args:
+            addrs: Addresses to read, in order
+
+        Returns:
+            List of (data, success) tuples, one per address
+        """
+        results = []
+        # Per-transfer handles bound once for the whole burst
+        clock_edge, paddr, penable = self._clock_edge, self.paddr, self.penable
+        pready, prdata, pslverr = self.pready, self.prdata, self.pslverr
+
+        self.psel.value = 1
+        self.pwrite.value = 0
+
+        for addr in addrs:
+            # SETUP phase
+            paddr.value = addr
+            penable.value = 0
+
+            await clock_edge
+
+            # ACCESS phase
+            penable.value = 1
+
+            await clock_edge
+            if not pready.value:
+                await self._wait_stalled()
+
+            # Sample data and error on the completing edge
+            results.append((int(prdata.value), not pslverr.value))
+
+        # Return to IDLE
+        self.psel.value = 0
+        self.penable.value = 0
+
+        await self._clock_edge
+
+        return results
+
+    async def write_burst(self, writes: list[tuple[int, int]]) -> bool:
+        """
+        Perform back-to-back APB3 writes without returning to IDLE.
+
+        Write counterpart of read_burst(): PSEL stays asserted and each
+        transfer goes straight from ACCESS into the next SETUP phase.
+
+        Args:
+            writes: (addr, data) pairs to write, in order
+
+        Returns:
+            True if every transfer succeeded, False if any slave error
+        """
+        error = False
+        # Per-transfer handles bound once for the whole burst
+        clock_edge, paddr, pwdata, penable = self._clock_edge, self.paddr, self.pwdata, self.penable
+        pready, pslverr = self.pready, self.pslverr
+
+        self.psel.value = 1
+        self.pwrite.value = 1
+
+        for addr, data in writes:
+            # SETUP phase
+            paddr.value = addr
+            pwdata.value = data
+            penable.value = 0
+
+            await clock_edge
+
+            # ACCESS phase
+            penable.value = 1
+
+            await clock_edge
+            if not pready.value:
+                await self._wait_stalled()
+
+            error |= bool(pslverr.value)
+
+        # Return to IDLE
+        self.psel.value = 0
+        self.penable.value = 0
+        self.pwrite.value = 0
+
+        await self._clock_edge
+
+        return not error
+
+    async def write_then_read(self, waddr: int, wdata: int, raddr: int) -> tuple[int, bool]:
+        """
+        Perform an APB3 write immediately followed by a read.
+
+        PSEL stays asserted between the two transfers, so the pair costs
+        four clock cycles instead of six.
+
+        Args:
+            waddr: Address to write
+            wdata: 32-bit data to write
+            raddr: Address to read after the write
+
+        Returns:
+            Tuple of (data, success)
+            - data: 32-bit read data
+            - success: True if neither transfer got a slave error
+        """
+        # Write SETUP phase
+        self.paddr.value = waddr
+        self.psel.value = 1
+        self.pwrite.value = 1
+        self.pwdata.value = wdata
+
+        await self._clock_edge
+
+        # Write ACCESS phase
+        self.penable.value = 1
+
+        await self._wait_ready()
+
+        error = bool(self.pslverr.value)
+
+        # Read SETUP phase, straight from the write ACCESS phase
+        self.paddr.value = raddr
+        self.pwrite.value = 0
+        self.penable.value = 0
+
+        await self._clock_edge
+
+        # Read ACCESS phase
+        self.penable.value = 1
+
+        await self._wait_ready()
+
+        data = int(self.prdata.value)
+        error |= bool(self.pslverr.value)
+
+        # Return to IDLE
+        self.psel.value = 0
+        self.penable.value = 0
+
+        await self._clock_edge
 
         return (data, not error)
 
@@ -148,11 +337,10 @@ class APB3Master:
         self.reset.value = 0  # Active-low reset
         self._init_signals()
 
-        for _ in range(duration_cycles):
-            await RisingEdge(self.clock)
+        await ClockCycles(self.clock, duration_cycles)
 
         self.reset.value = 1  # Deassert reset
-        await RisingEdge(self.clock)
+        await self._clock_edge
 
 
 class APB3DebugInterface:
@@ -169,6 +357,7 @@ class APB3DebugInterface:
     DBG_PC = 0x008
     DBG_INSTR = 0x00C
     DBG_GPR_BASE = 0x010  # GPR0-GPR31 at 0x010-0x08C
+    GPR_ADDRS = tuple(range(DBG_GPR_BASE, DBG_GPR_BASE + 32 * 4, 4))  # Indexed by register number
     DBG_BP0_ADDR = 0x100
     DBG_BP0_CTRL = 0x104
     DBG_BP1_ADDR = 0x108
@@ -193,35 +382,153 @@ class APB3DebugInterface:
         """
         self.apb = apb_master
 
+        # Read cache for PC/INSTR/GPR registers. These only change through
+        # debug writes while the CPU is halted, so the cache is only filled
+        # once is_halted() has observed the HALTED bit.
+        self._rd_cache: dict[int, int] = {}
+        self._cache_valid = False
+
+        # Resolved register-file handles for dump_registers_backdoor()
+        self._backdoor_handles: dict[str, object] = {}
+
+        # Internal halted flag, if the simulator exposes it (e.g. Verilator
+        # built with --public-flat-rw); lets wait_halted() skip STATUS polling
+        try:
+            self._dbg_halted = apb_master.dut.dbg_halted
+        except AttributeError:
+            self._dbg_halted = None
+
+    def invalidate_cache(self):
+        """
+        Drop all cached register values.
+
+        Call this after anything outside the debug interface can change
+        CPU state (e.g. toggling rst_n directly).
+        """
+        self._rd_cache.clear()
+        self._cache_valid = False
+
+    async def _write(self, addr: int, data: int):
+        """Write a debug register, invalidating affected cache entries."""
+        if addr == self.DBG_CTRL:
+            # Halt/resume/step/reset may all change CPU state
+            self.invalidate_cache()
+        else:
+            self._rd_cache.clear()
+        await self.apb.write(addr, data)
+
+    async def _write_burst(self, writes: list[tuple[int, int]]):
+        """Write several debug registers back-to-back, invalidating the cache."""
+        if any(addr == self.DBG_CTRL for addr, _ in writes):
+            self.invalidate_cache()
+        else:
+            self._rd_cache.clear()
+        await self.apb.write_burst(writes)
+
+    async def _cached_read(self, addr: int) -> int:
+        """Read a side-effect-free debug register, using the cache when halted."""
+        if self._cache_valid and addr in self._rd_cache:
+            return self._rd_cache[addr]
+
+        data, _ = await self.apb.read(addr)
+        if self._cache_valid:
+            self._rd_cache[addr] = data
+        return data
+
     async def halt_cpu(self):
         """Request CPU halt."""
-        await self.apb.write(self.DBG_CTRL, self.CTRL_HALT_REQ)
+        await self._write(self.DBG_CTRL, self.CTRL_HALT_REQ)
 
     async def resume_cpu(self):
         """Request CPU resume."""
-        await self.apb.write(self.DBG_CTRL, self.CTRL_RESUME_REQ)
+        await self._write(self.DBG_CTRL, self.CTRL_RESUME_REQ)
+
+    async def step_cpu(self, settle_cycles: int = 0):
+        """
+        Request CPU single-step.
+
+        Args:
+            settle_cycles: Extra clock cycles to wait after the write
+                (the APB write already ends on a clock edge)
+        """
+        await self._write(self.DBG_CTRL, self.CTRL_STEP_REQ)
+        if settle_cycles > 0:
+            await ClockCycles(self.apb.clock, settle_cycles)
+
+    async def reset_cpu(self, settle_cycles: int = 0):
+        """
+        Request CPU reset.
+
+        Args:
+            settle_cycles: Extra clock cycles to wait after the write
+                (the APB write already ends on a clock edge)
+        """
+        await self._write(self.DBG_CTRL, self.CTRL_RESET_REQ)
+        if settle_cycles > 0:
+            await ClockCycles(self.apb.clock, settle_cycles)
 
-    async def step_cpu(self):
-        """Request CPU single-step."""
-        await self.apb.write(self.DBG_CTRL, self.CTRL_STEP_REQ)
+    async def halt_and_check(self) -> bool:
+        """
+        Request CPU halt and read back STATUS in the same APB access pair.
 
-    async def reset_cpu(self):
-        """Request CPU reset."""
-        await self.apb.write(self.DBG_CTRL, self.CTRL_RESET_REQ)
+        Returns:
+            True if the CPU already reports halted
+        """
+        self.invalidate_cache()
+        data, _ = await self.apb.write_then_read(
+            self.DBG_CTRL, self.CTRL_HALT_REQ, self.DBG_STATUS
+        )
+        return self._update_halted(data)
 
     async def is_halted(self) -> bool:
-        """Check if CPU is halted."""
+        """Check if CPU is halted (never cached)."""
         data, _ = await self.apb.read(self.DBG_STATUS)
-        return bool(data & self.STATUS_HALTED)
+        return self._update_halted(data)
+
+    def _update_halted(self, status: int) -> bool:
+        """Enable or drop the read cache from a freshly read STATUS value."""
+        halted = bool(status & self.STATUS_HALTED)
+        if halted:
+            self._cache_valid = True
+        else:
+            self.invalidate_cache()
+        return halted
+
+    async def wait_halted(self, timeout_cycles: int = 100):
+        """
+        Wait until the CPU reports halted.
+
+        Sleeps on the rising edge of dbg_halted when it is visible, otherwise
+        polls DBG_STATUS once per cycle.
+
+        Args:
+            timeout_cycles: Maximum cycles to wait
+
+        Raises:
+            TimeoutError: If the CPU does not halt within timeout_cycles
+        """
+        if self._dbg_halted is not None:
+            if not self._dbg_halted.value:
+                timeout = ClockCycles(self.apb.clock, timeout_cycles)
+                if await First(RisingEdge(self._dbg_halted), timeout) is timeout:
+                    raise TimeoutError(f"CPU did not halt within {timeout_cycles} cycles")
+            # Halted: debug reads are now side-effect free
+            self._cache_valid = True
+            return
+
+        for _ in range(timeout_cycles):
+            if await self.is_halted():
+                return
+            await RisingEdge(self.apb.clock)
+        raise TimeoutError(f"CPU did not halt within {timeout_cycles} cycles")
 
     async def read_pc(self) -> int:
         """Read program counter."""
-        data, _ = await self.apb.read(self.DBG_PC)
-        return data
+        return await self._cached_read(self.DBG_PC)
 
     async def write_pc(self, value: int):
         """Write program counter (only when halted)."""
-        await self.apb.write(self.DBG_PC, value)
+        await self._write(self.DBG_PC, value)
 
     async def read_gpr(self, reg_num: int) -> int:
         """
@@ -234,9 +541,36 @@ class APB3DebugInterface:
             Register value
         """
         assert 0 <= reg_num <= 31, "Register number must be 0-31"
+        if reg_num == 0:
+            return 0  # x0 is hardwired to zero
         addr = self.DBG_GPR_BASE + (reg_num * 4)
-        data, _ = await self.apb.read(addr)
-        return data
+        return await self._cached_read(addr)
+
+    async def atomic_read_gpr(self, reg_num: int, resume: bool = True,
+                              timeout_cycles: int = 100) -> int:
+        """
+        Halt the CPU, read one general purpose register and resume it.
+
+        Args:
+            reg_num: Register number (0-31)
+            resume: Resume the CPU after the read (set False if the caller
+                wants it to stay halted)
+            timeout_cycles: Maximum cycles to wait for the halt to take effect
+
+        Returns:
+            Register value
+
+        Raises:
+            TimeoutError: If the CPU does not halt within timeout_cycles
+        """
+        await self.halt_cpu()
+        await self.wait_halted(timeout_cycles)
+
+        value = await self.read_gpr(reg_num)
+
+        if resume:
+            await self.resume_cpu()
+        return value
 
     async def write_gpr(self, reg_num: int, value: int):
         """
@@ -248,7 +582,88 @@ class APB3DebugInterface:
         """
         assert 0 <= reg_num <= 31, "Register number must be 0-31"
         addr = self.DBG_GPR_BASE + (reg_num * 4)
-        await self.apb.write(addr, value)
+        await self._write(addr, value)
+
+    async def write_gpr_burst(self, values: dict[int, int]):
+        """
+        Write several general purpose registers in a single APB burst
+        (only when halted).
+
+        Args:
+            values: Dictionary mapping {reg_num: value}
+        """
+        assert all(0 <= r <= 31 for r in values), "Register number must be 0-31"
+        await self._write_burst(
+            [(self.DBG_GPR_BASE + (r * 4), v) for r, v in values.items()]
+        )
+
+    async def read_gprs(self, reg_nums) -> dict[int, int]:
+        """
+        Read a set of general purpose registers in a single APB burst.
+
+        x0 and registers already in the read cache cost no bus cycles.
+
+        Args:
+            reg_nums: Register numbers (0-31) to read
+
+        Returns:
+            Dictionary mapping {reg_num: value}
+        """
+        values = {}
+        to_read = []
+        for reg_num in reg_nums:
+            assert 0 <= reg_num <= 31, "Register number must be 0-31"
+            addr = self.GPR_ADDRS[reg_num]
+            if reg_num == 0:
+                values[0] = 0  # x0 is hardwired to zero
+            elif self._cache_valid and addr in self._rd_cache:
+                values[reg_num] = self._rd_cache[addr]
+            else:
+                to_read.append(reg_num)
+
+        if to_read:
+            addrs = [self.GPR_ADDRS[r] for r in to_read]
+            results = await self.apb.read_burst(addrs)
+            for reg_num, addr, (data, _) in zip(to_read, addrs, results):
+                values[reg_num] = data
+                if self._cache_valid:
+                    self._rd_cache[addr] = data
+        return values
+
+    async def dump_registers(self) -> list[int]:
+        """
+        Read all 32 general purpose registers in a single APB burst.
+
+        Returns:
+            List of register values indexed by register number
+        """
+        values = await self.read_gprs(range(32))
+        return [values[i] for i in range(32)]
+
+    def dump_registers_backdoor(self, path: str = "u_core.u_regfile.regs") -> list[int]:
+        """
+        Read all 32 general purpose registers directly from the register file.
+
+        Bypasses the APB bus entirely (no clock cycles consumed), so it is
+        intended for snapshots and debug logging; use dump_registers() when
+        the debug path itself is under test. Requires the simulator to expose
+        internal signals (e.g. Verilator --public-flat-rw).
+
+        Args:
+            path: Dotted hierarchy path from the DUT to the x1-x31 array
+
+        Returns:
+            List of register values indexed by register number
+        """
+        regs = self._backdoor_handles.get(path)
+        if regs is None:
+            regs = self.apb.dut
+            for name in path.split("."):
+                regs = getattr(regs, name)
+            self._backdoor_handles[path] = regs
+
+        # x0 is hardwired to zero and not stored in the array
+        return [0] + [int(regs[i].value) for i in range(1, 32)]
 
     async def set_breakpoint(self, bp_num: int, addr: int, enable: bool = True):
         """
@@ -261,9 +676,9 @@ class APB3DebugInterface:
         """
         assert bp_num in [0, 1], "Breakpoint number must be 0 or 1"
 
+        # Address and control are always written as a pair
         if bp_num == 0:
-            await self.apb.write(self.DBG_BP0_ADDR, addr)
-            await self.apb.write(self.DBG_BP0_CTRL, 1 if enable else 0)
+            addr_reg, ctrl_reg = self.DBG_BP0_ADDR, self.DBG_BP0_CTRL
         else:
-            await self.apb.write(self.DBG_BP1_ADDR, addr)
-            await self.apb.write(self.DBG_BP1_CTRL, 1 if enable else 0)
+            addr_reg, ctrl_reg = self.DBG_BP1_ADDR, self.DBG_BP1_CTRL
+        await self._write_burst([(addr_reg, addr), (ctrl_reg, 1 if enable else 0)])
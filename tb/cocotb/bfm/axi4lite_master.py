@@ -6,7 +6,8 @@ Used to initiate read/write transactions on the AXI4-Lite bus.
 """
 
 import cocotb
-from cocotb.triggers import RisingEdge, Timer
+from cocotb.handle import Immediate
+from cocotb.triggers import ClockCycles, First, RisingEdge, Timer
 from cocotb.types import LogicArray
 from typing import Optional
 
@@ -24,7 +25,18 @@ class AXI4LiteMaster:
     - Outstanding transactions: 1 (simple design)
     """
 
-    def __init__(self, dut, name, clock, reset=None):
+    # Handles are read every cycle; slots avoid a per-instance __dict__
+    __slots__ = (
+        "dut", "clock", "reset", "timeout_cycles", "_clock_edge",
+        "awvalid", "awready", "awaddr", "awprot",
+        "wvalid", "wready", "wdata", "wstrb",
+        "bvalid", "bready", "bresp",
+        "arvalid", "arready", "araddr", "arprot",
+        "rvalid", "rready", "rdata", "rresp",
+        "_awprot_val", "_arprot_val", "_wstrb_val",
+    )
+
+    def __init__(self, dut, name, clock, reset=None, timeout_cycles: int = 1000):
         """
         Initialize AXI4-Lite master.
 
@@ -33,10 +45,14 @@ class AXI4LiteMaster:
             name: Prefix for signal names (e.g., 'axi_')
             clock: Clock signal
             reset: Reset signal (optional)
+            timeout_cycles: Maximum cycles to wait for a handshake
         """
         self.dut = dut
         self.clock = clock
+        # One trigger object reused for every clock-edge await
+        self._clock_edge = RisingEdge(clock)
         self.reset = reset
+        self.timeout_cycles = timeout_cycles
 
         # Write address channel
         self.awvalid = getattr(dut, f"{name}awvalid")
@@ -71,27 +87,67 @@ class AXI4LiteMaster:
         self._init_signals()
 
     def _init_signals(self):
-        """Initialize all master outputs to idle state."""
+        """
+        Initialize all master outputs to idle state.
+
+        Only called at construction or while reset is asserted, so the
+        values are applied immediately rather than scheduled as inertial
+        writes.
+        """
         # Write address channel
-        self.awvalid.value = 0
-        self.awaddr.value = 0
-        self.awprot.value = 0
+        self.awvalid.value = Immediate(0)
+        self.awaddr.value = Immediate(0)
+        self.awprot.value = Immediate(0)
+        self._awprot_val = 0
 
         # Write data channel
-        self.wvalid.value = 0
-        self.wdata.value = 0
-        self.wstrb.value = 0xF  # All bytes valid by default
+        self.wvalid.value = Immediate(0)
+        self.wdata.value = Immediate(0)
+        self.wstrb.value = Immediate(0xF)  # All bytes valid by default
+        self._wstrb_val = 0xF
 
         # Write response channel
-        self.bready.value = 1  # Always ready to accept responses
+        self.bready.value = Immediate(1)  # Always ready to accept responses
 
         # Read address channel
-        self.arvalid.value = 0
-        self.araddr.value = 0
-        self.arprot.value = 0
+        self.arvalid.value = Immediate(0)
+        self.araddr.value = Immediate(0)
+        self.arprot.value = Immediate(0)
+        self._arprot_val = 0
 
         # Read data channel
-        self.rready.value = 1  # Always ready to accept data
+        self.rready.value = Immediate(1)  # Always ready to accept data
+
+    async def _wait_high(self, signal, label: str):
+        """
+        Return on the first clock edge at which a slave signal is high.
+
+        While the signal is low, sleep on its rising edge instead of waking
+        up every clock cycle. label names the signal in the timeout error.
+
+        Raises:
+            TimeoutError: If the signal does not rise within timeout_cycles
+        """
+        await self._clock_edge
+        if signal.value:
+            return
+
+        timeout = ClockCycles(self.clock, self.timeout_cycles)
+        if await First(RisingEdge(signal), timeout) is timeout:
+            raise TimeoutError(
+                f"AXI slave did not assert {label} within {self.timeout_cycles} cycles"
+            )
+        await self._clock_edge
+
+    async def _handshake(self, valid, ready, label: str):
+        """
+        Complete one address/data channel handshake.
+
+        VALID is driven by this master and already high, so only the
+        slave's READY is waited on before VALID is dropped.
+        """
+        await self._wait_high(ready, label)
+        valid.value = 0
 
     async def write(self, addr: int, data: int, strb: int = 0xF, prot: int = 0) -> int:
         """
@@ -106,37 +162,86 @@ class AXI4LiteMaster:
         Returns:
             Response code (0=OKAY, 1=EXOKAY, 2=SLVERR, 3=DECERR)
         """
-        # Write address phase
+        # Write address phase. AxPROT and WSTRB are only re-driven when they
+        # change; they almost always keep the defaults set by _init_signals().
         self.awvalid.value = 1
         self.awaddr.value = addr
-        self.awprot.value = prot
+        if prot != self._awprot_val:
+            self.awprot.value = prot
+            self._awprot_val = prot
 
         # Write data phase (can happen simultaneously with address)
         self.wvalid.value = 1
         self.wdata.value = data
-        self.wstrb.value = strb
+        if strb != self._wstrb_val:
+            self.wstrb.value = strb
+            self._wstrb_val = strb
+
+        # Common case: the slave accepts address and data on the same edge,
+        # so both VALIDs drop together without starting any tasks
+        await self._clock_edge
+        aw_ready = bool(self.awready.value)
+        w_ready = bool(self.wready.value)
+
+        if aw_ready:
+            self.awvalid.value = 0
+        if w_ready:
+            self.wvalid.value = 0
+
+        # Otherwise AW and W complete independently. Each VALID must drop
+        # as soon as its own handshake happens (holding it would be seen
+        # as a second transfer), so AW waits in its own task while W is
+        # handled inline, and the write then joins on the AW task.
+        if not aw_ready and not w_ready:
+            aw_task = cocotb.start_soon(
+                self._handshake(self.awvalid, self.awready, "AWREADY")
+            )
+            try:
+                await self._handshake(self.wvalid, self.wready, "WREADY")
+                await aw_task
+            finally:
+                aw_task.cancel()
+        elif not aw_ready:
+            await self._handshake(self.awvalid, self.awready, "AWREADY")
+        elif not w_ready:
+            await self._handshake(self.wvalid, self.wready, "WREADY")
+
+        # Wait for write response (BREADY is held high)
+        if not self.bvalid.value:
+            await self._wait_high(self.bvalid, "BVALID")
 
-        # Wait for address and data handshakes
-        aw_done = False
-        w_done = False
+        resp = int(self.bresp.value)
+        return resp
 
-        while not (aw_done and w_done):
-            await RisingEdge(self.clock)
+    async def write_many(self, writes) -> list[int]:
+        """
+        Perform a sequence of full-word AXI4-Lite writes back-to-back.
 
-            if self.awvalid.value and self.awready.value:
-                aw_done = True
-                self.awvalid.value = 0
+        The master allows one outstanding transaction, so each write still
+        waits for its B response. The next AW/W pair is driven on the same
+        edge the response is accepted, with no idle cycle in between.
 
-            if self.wvalid.value and self.wready.value:
-                w_done = True
-                self.wvalid.value = 0
+        Args:
+            writes: Iterable of (addr, data) pairs, written in order
 
-        # Wait for write response
-        while not (self.bvalid.value and self.bready.value):
-            await RisingEdge(self.clock)
+        Returns:
+            List of response codes, one per write
+        """
+        write = self.write
+        return [await write(addr, data) for addr, data in writes]
 
-        resp = int(self.bresp.value)
-        return resp
+    async def load_program(self, program: dict[int, int]) -> bool:
+        """
+        Write a program image through the AXI4-Lite slave port.
+
+        Args:
+            program: Dictionary mapping {address: instruction}
+
+        Returns:
+            True if every write got an OKAY response
+        """
+        resps = await self.write_many(sorted(program.items()))
+        return not any(resps)
 
     async def read(self, addr: int, prot: int = 0) -> tuple[int, int]:
         """
@@ -154,17 +259,18 @@ class AXI4LiteMaster:
         # Read address phase
         self.arvalid.value = 1
         self.araddr.value = addr
-        self.arprot.value = prot
+        if prot != self._arprot_val:
+            self.arprot.value = prot
+            self._arprot_val = prot
 
-        # Wait for address handshake
-        while not (self.arvalid.value and self.arready.value):
-            await RisingEdge(self.clock)
+        # Wait for address handshake (ARVALID is ours and held high)
+        await self._wait_high(self.arready, "ARREADY")
 
         self.arvalid.value = 0
 
-        # Wait for read data
-        while not (self.rvalid.value and self.rready.value):
-            await RisingEdge(self.clock)
+        # Wait for read data (RREADY is held high)
+        if not self.rvalid.value:
+            await self._wait_high(self.rvalid, "RVALID")
 
         data = int(self.rdata.value)
         resp = int(self.rresp.value)
@@ -184,8 +290,7 @@ class AXI4LiteMaster:
         self.reset.value = 0  # Active-low reset
         self._init_signals()
 
-        for _ in range(duration_cycles):
-            await RisingEdge(self.clock)
+        await ClockCycles(self.clock, duration_cycles)
 
         self.reset.value = 1  # Deassert reset
-        await RisingEdge(self.clock)
+        await self._clock_edge
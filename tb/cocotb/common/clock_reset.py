@@ -4,22 +4,29 @@ Clock and reset utilities for cocotb testbenches.
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, Timer
+from cocotb.triggers import ClockCycles, RisingEdge, Timer
+from cocotb.types import LogicArray
+from typing import Optional
 
 
-async def setup_clock(dut, clock_period_ns: int = 10):
+async def setup_clock(dut, clock_period_ns: int = 10, impl: Optional[str] = None):
     """
     Setup clock for DUT.
 
+    By default cocotb picks the clock implementation (the C-level "gpi"
+    clock only when COCOTB_TRUST_INERTIAL_WRITES is set); pass impl to
+    force "gpi" or "py".
+
     Args:
         dut: Device under test
         clock_period_ns: Clock period in nanoseconds (default 10ns = 100MHz)
+        impl: Clock implementation, "gpi", "py" or None for cocotb's choice
 
     Returns:
-        Clock coroutine
+        Running Clock object
     """
-    clock = Clock(dut.clk, clock_period_ns, units="ns")
-    cocotb.start_soon(clock.start())
+    clock = Clock(dut.clk, clock_period_ns, unit="ns", impl=impl)
+    clock.start()
     return clock
 
 
@@ -36,15 +43,47 @@ async def reset_dut(dut, duration_cycles: int = 10):
     dut.rst_n.value = 0  # Assert reset (active-low)
 
     # Wait for specified cycles
-    for _ in range(duration_cycles):
-        await RisingEdge(dut.clk)
+    await ClockCycles(dut.clk, duration_cycles)
 
     dut.rst_n.value = 1  # Deassert reset
 
     # Wait a few cycles after reset
-    for _ in range(2):
+    await ClockCycles(dut.clk, 2)
+
+
+async def bringup(dut, clock_period_ns: int = 10, reset_cycles: int = 10,
+                  soft_reset_cycles: int = 2):
+    """
+    Start the clock and reset the DUT at the top of a test.
+
+    All tests in a module share one simulator run, so only the first test
+    pays for the full reset_dut() sequence (remembered as
+    dut._bringup_done); later tests just pulse rst_n for soft_reset_cycles.
+    The clock is restarted every time because cocotb stops a test's clock
+    task when the test ends.
+
+    Args:
+        dut: Device under test
+        clock_period_ns: Clock period in nanoseconds
+        reset_cycles: Cycles to hold reset on the first bring-up
+        soft_reset_cycles: Cycles to hold reset on later bring-ups
+
+    Returns:
+        Running Clock object
+    """
+    clock = await setup_clock(dut, clock_period_ns)
+
+    if not getattr(dut, "_bringup_done", False):
+        await reset_dut(dut, reset_cycles)
+        dut._bringup_done = True
+    else:
+        dut.rst_n.value = 0
+        await ClockCycles(dut.clk, soft_reset_cycles)
+        dut.rst_n.value = 1
         await RisingEdge(dut.clk)
 
+    return clock
+
 
 async def wait_cycles(dut, num_cycles: int):
     """
@@ -54,8 +93,7 @@ async def wait_cycles(dut, num_cycles: int):
         dut: Device under test
         num_cycles: Number of cycles to wait
     """
-    for _ in range(num_cycles):
-        await RisingEdge(dut.clk)
+    await ClockCycles(dut.clk, num_cycles)
 
 
 async def wait_for_signal(
@@ -74,14 +112,29 @@ async def wait_for_signal(
         TimeoutError: If signal doesn't reach expected value within timeout
     """
     signal = getattr(dut, signal_name)
-    cycles = 0
-
-    while int(signal.value) != value:
-        await RisingEdge(dut.clk)
-        cycles += 1
 
-        if cycles >= timeout_cycles:
-            raise TimeoutError(
-                f"Signal '{signal_name}' did not reach value {value} "
-                f"within {timeout_cycles} cycles (current value: {signal.value})"
-            )
+    # Compare against a LogicArray built once rather than converting the
+    # signal to an int on every check; X/Z then compare unequal instead of
+    # raising. value is masked to the signal width (negative values wrap
+    # to two's complement) so from_unsigned() accepts any int.
+    current = signal.value
+    if isinstance(current, LogicArray):
+        width = len(current)
+        target = LogicArray.from_unsigned(value & ((1 << width) - 1), width)
+    else:
+        target = value
+    if current == target:
+        return
+
+    # Check once per clock edge with a single reused trigger; counting edges
+    # bounds the total wait without a separate timeout task
+    clk_edge = RisingEdge(dut.clk)
+    for _ in range(timeout_cycles):
+        await clk_edge
+        if signal.value == target:
+            return
+
+    raise TimeoutError(
+        f"Signal '{signal_name}' did not reach value {value} "
+        f"within {timeout_cycles} cycles (current value: {signal.value})"
+    )
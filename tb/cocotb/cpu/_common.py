@@ -0,0 +1,80 @@
+"""
+Helpers shared by the CPU cocotb test modules.
+"""
+
+from cocotb.handle import Immediate
+from cocotb.triggers import ClockCycles, RisingEdge
+
+
+# Testbench-driven DUT inputs and their idle values while in reset
+_RESET_IDLE = (
+    ("axi_arready", 0),
+    ("axi_rvalid", 0),
+    ("axi_rdata", 0),
+    ("axi_rresp", 0),
+    ("axi_awready", 0),
+    ("axi_wready", 0),
+    ("axi_bvalid", 0),
+    ("axi_bresp", 0),
+    ("apb_psel", 0),
+    ("apb_penable", 0),
+    ("apb_pwrite", 0),
+    ("apb_paddr", 0),
+    ("apb_pwdata", 0),
+)
+
+
+async def reset_dut(dut):
+    """Apply reset to DUT (idle values are written immediately, not scheduled).
+
+    The idle-value handles are resolved on the first call and kept on the
+    DUT object, so later resets are a single loop of writes.
+    """
+    try:
+        idle = dut._reset_idle_handles
+    except AttributeError:
+        idle = dut._reset_idle_handles = [
+            (getattr(dut, name), value) for name, value in _RESET_IDLE
+        ]
+
+    dut.rst_n.value = Immediate(0)
+    for handle, value in idle:
+        handle.value = Immediate(value)
+
+    # Hold reset for 5 rising edges, whatever the clock period
+    await ClockCycles(dut.clk, 5)
+    dut.rst_n.value = Immediate(1)
+    await ClockCycles(dut.clk, 2)
+
+
+async def apb_write_burst(dut, writes):
+    """Write each (addr, data) in writes back-to-back on the APB debug port.
+
+    Must be called on a rising clock edge. PSEL and PWRITE stay asserted
+    across the burst and only PENABLE toggles, so each write is SETUP +
+    ACCESS (2 clocks) and the bus is released once at the end.
+    """
+    psel = dut.apb_psel
+    penable = dut.apb_penable
+    paddr = dut.apb_paddr
+    pwdata = dut.apb_pwdata
+    clk_edge = RisingEdge(dut.clk)
+
+    psel.value = 1
+    dut.apb_pwrite.value = 1
+    for addr, data in writes:
+        # Setup phase
+        penable.value = 0
+        paddr.value = addr
+        pwdata.value = data
+
+        # Access phase
+        await clk_edge
+        penable.value = 1
+
+        await clk_edge
+
+    # End transfer
+    psel.value = 0
+    penable.value = 0
+    dut.apb_pwrite.value = 0
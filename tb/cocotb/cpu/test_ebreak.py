@@ -15,30 +15,52 @@ Test Steps:
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, Timer, ClockCycles, ReadOnly
-from pathlib import Path
-import sys
+from cocotb.triggers import RisingEdge, Timer, ClockCycles, ReadOnly, First
+import struct
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+# Shared reset sequence (idle bus values written immediately)
+from tb.cocotb.cpu._common import reset_dut
+
+# Debug register offsets (from MEMORY_MAP.md)
+DBG_CTRL = 0x000
+DBG_STATUS = 0x004
+DBG_PC = 0x008
+DBG_INSTR = 0x00C
+DBG_GPR_BASE = 0x010  # DBG_GPR[n] = 0x010 + (n * 4)
+
+# Little-endian 32-bit word accessors for the bytearray-backed memory
+_WORD = struct.Struct("<I")
+_pack_word = _WORD.pack_into
+_unpack_word = _WORD.unpack_from
 
 
 class APBDebugInterface:
     """APB3 debug interface helper for CPU register access."""
 
-    # Debug register offsets (from MEMORY_MAP.md)
-    DBG_CTRL = 0x000
-    DBG_STATUS = 0x004
-    DBG_PC = 0x008
-    DBG_INSTR = 0x00C
-    DBG_GPR_BASE = 0x010  # DBG_GPR[n] = 0x010 + (n * 4)
+    # Debug register offsets (module constants, kept here for callers)
+    DBG_CTRL = DBG_CTRL
+    DBG_STATUS = DBG_STATUS
+    DBG_PC = DBG_PC
+    DBG_INSTR = DBG_INSTR
+    DBG_GPR_BASE = DBG_GPR_BASE
 
     def __init__(self, dut):
         self.dut = dut
-
-    async def apb_write(self, addr, data):
-        """Write to APB debug register."""
-        await RisingEdge(self.dut.clk)
+        # Internal halted flag; only visible with --public-flat-rw
+        try:
+            self.dbg_halted = dut.dbg_halted
+        except AttributeError:
+            self.dbg_halted = None
+
+    async def apb_write(self, addr, data, aligned=False):
+        """Write to APB debug register.
+
+        Every transfer here ends on a clock edge. Pass aligned=True when
+        the caller is already on one (e.g. straight after another APB
+        access) to start SETUP immediately instead of idling a cycle.
+        """
+        if not aligned:
+            await RisingEdge(self.dut.clk)
         self.dut.apb_psel.value = 1
         self.dut.apb_penable.value = 0
         self.dut.apb_pwrite.value = 1
@@ -53,10 +75,11 @@ class APBDebugInterface:
         self.dut.apb_penable.value = 0
         self.dut.apb_pwrite.value = 0
 
-    async def apb_read(self, addr):
-        """Read from APB debug register."""
+    async def apb_read(self, addr, aligned=False):
+        """Read from APB debug register (see apb_write() for aligned)."""
         # Setup phase
-        await RisingEdge(self.dut.clk)
+        if not aligned:
+            await RisingEdge(self.dut.clk)
         self.dut.apb_psel.value = 1
         self.dut.apb_penable.value = 0
         self.dut.apb_pwrite.value = 0
@@ -77,129 +100,193 @@ class APBDebugInterface:
 
         return data
 
-    async def halt_cpu(self):
-        """Halt the CPU via debug interface."""
-        await self.apb_write(self.DBG_CTRL, 0x1)  # HALT_REQ
-        # Wait for CPU to halt
-        for _ in range(10):
-            status = await self.apb_read(self.DBG_STATUS)
-            if status & 0x1:  # HALTED bit
-                return
+    async def apb_poll(self, addr, mask, max_polls, aligned=False):
+        """
+        Read a debug register back-to-back until any bit in mask is set.
+
+        PSEL and PADDR stay asserted between polls, so each poll is one
+        ACCESS -> SETUP pair (2 cycles) instead of a full 3-cycle read.
+
+        Returns:
+            The last value read (check it against mask for success)
+        """
+        # Setup phase (once for the whole poll)
+        if not aligned:
             await RisingEdge(self.dut.clk)
-        raise RuntimeError("CPU did not halt")
+        self.dut.apb_psel.value = 1
+        self.dut.apb_penable.value = 0
+        self.dut.apb_pwrite.value = 0
+        self.dut.apb_paddr.value = addr
+
+        for _ in range(max_polls):
+            # Access phase
+            await RisingEdge(self.dut.clk)
+            self.dut.apb_penable.value = 1
+
+            await ReadOnly()
+            data = int(self.dut.apb_prdata.value)
+
+            # Transfer completes; go back to SETUP for the next poll
+            await RisingEdge(self.dut.clk)
+            self.dut.apb_penable.value = 0
+            if data & mask:
+                break
+
+        # End transfer
+        self.dut.apb_psel.value = 0
+
+        return data
+
+    async def halt_cpu(self):
+        """Halt the CPU via debug interface.
+
+        When dbg_halted is visible the wait is a single trigger on it;
+        otherwise DBG_STATUS is polled over APB.
+        """
+        await self.apb_write(DBG_CTRL, 0x1)  # HALT_REQ
+        # Wait for CPU to halt (same ~40 cycle window as 10 separate reads)
+        dbg_halted = self.dbg_halted
+        if dbg_halted is not None:
+            if not dbg_halted.value:
+                await First(RisingEdge(dbg_halted), ClockCycles(self.dut.clk, 40))
+            halted = bool(dbg_halted.value)
+        else:
+            status = await self.apb_poll(DBG_STATUS, 0x1, 20, aligned=True)  # HALTED bit
+            halted = bool(status & 0x1)
+        if not halted:
+            raise RuntimeError("CPU did not halt")
 
     async def resume_cpu(self):
         """Resume the CPU via debug interface."""
-        await self.apb_write(self.DBG_CTRL, 0x2)  # RESUME_REQ
+        await self.apb_write(DBG_CTRL, 0x2)  # RESUME_REQ
         # Wait for CPU to resume
-        for _ in range(10):
-            status = await self.apb_read(self.DBG_STATUS)
-            if status & 0x2:  # RUNNING bit
-                return
-            await RisingEdge(self.dut.clk)
-        raise RuntimeError("CPU did not resume")
+        status = await self.apb_poll(DBG_STATUS, 0x2, 20, aligned=True)  # RUNNING bit
+        if not status & 0x2:
+            raise RuntimeError("CPU did not resume")
 
     async def read_pc(self):
         """Read program counter."""
-        return await self.apb_read(self.DBG_PC)
+        return await self.apb_read(DBG_PC)
 
     async def write_pc(self, value):
         """Write program counter (only when halted)."""
-        await self.apb_write(self.DBG_PC, value)
+        await self.apb_write(DBG_PC, value)
 
 
 class SimpleAXIMemory:
-    """Simple AXI4-Lite memory model for testing."""
+    """Simple AXI4-Lite memory model for testing.
 
-    def __init__(self, dut):
+    Backed by a flat little-endian bytearray (64 KB by default).
+    """
+
+    def __init__(self, dut, mem_size=0x10000):
         self.dut = dut
-        self.mem = {}
+        self.mem = bytearray(mem_size)
+        # Cache signal handles; each dut.<name> lookup walks the hierarchy
+        self.clk = dut.clk
+        self.axi_araddr = dut.axi_araddr
+        self.axi_arready = dut.axi_arready
+        self.axi_arvalid = dut.axi_arvalid
+        self.axi_awaddr = dut.axi_awaddr
+        self.axi_awready = dut.axi_awready
+        self.axi_awvalid = dut.axi_awvalid
+        self.axi_bready = dut.axi_bready
+        self.axi_bresp = dut.axi_bresp
+        self.axi_bvalid = dut.axi_bvalid
+        self.axi_rdata = dut.axi_rdata
+        self.axi_rready = dut.axi_rready
+        self.axi_rresp = dut.axi_rresp
+        self.axi_rvalid = dut.axi_rvalid
+        self.axi_wdata = dut.axi_wdata
+        self.axi_wready = dut.axi_wready
+        self.axi_wvalid = dut.axi_wvalid
         cocotb.start_soon(self.axi_read_handler())
         cocotb.start_soon(self.axi_write_handler())
 
     def write_word(self, addr, data):
         """Write 32-bit word to memory."""
-        self.mem[addr & 0xFFFFFFFC] = data & 0xFFFFFFFF
+        addr &= 0xFFFFFFFC
+        if addr + 4 > len(self.mem):
+            raise IndexError(f"Write to 0x{addr:08x} outside {len(self.mem)}-byte memory")
+        _pack_word(self.mem, addr, data & 0xFFFFFFFF)
 
     def read_word(self, addr):
-        """Read 32-bit word from memory."""
-        return self.mem.get(addr & 0xFFFFFFFC, 0)
+        """Read 32-bit word from memory (unmapped addresses read as 0)."""
+        addr &= 0xFFFFFFFC
+        if addr + 4 > len(self.mem):
+            return 0
+        return _unpack_word(self.mem, addr)[0]
 
     async def axi_read_handler(self):
-        """Handle AXI read transactions."""
+        """
+        Handle AXI read transactions.
+
+        While the bus is idle the handler sleeps on ARVALID rather than
+        waking up every clock cycle.
+        """
         while True:
-            await RisingEdge(self.dut.clk)
+            await RisingEdge(self.clk)
 
-            if self.dut.axi_arvalid.value == 1:
+            if not self.axi_arvalid.value:
+                self.axi_arready.value = 0
+                await RisingEdge(self.axi_arvalid)
+            else:
                 # Accept address
-                self.dut.axi_arready.value = 1
-                addr = int(self.dut.axi_araddr.value)
+                self.axi_arready.value = 1
+                addr = int(self.axi_araddr.value)
                 data = self.read_word(addr)
 
                 # Provide data on next cycle
-                await RisingEdge(self.dut.clk)
-                self.dut.axi_arready.value = 0
-                self.dut.axi_rvalid.value = 1
-                self.dut.axi_rdata.value = data
-                self.dut.axi_rresp.value = 0
-
-                # Wait for rready
-                while self.dut.axi_rready.value == 0:
-                    await RisingEdge(self.dut.clk)
-
-                await RisingEdge(self.dut.clk)
-                self.dut.axi_rvalid.value = 0
-            else:
-                self.dut.axi_arready.value = 0
+                await RisingEdge(self.clk)
+                self.axi_arready.value = 0
+                self.axi_rvalid.value = 1
+                self.axi_rdata.value = data
+                self.axi_rresp.value = 0
+
+                # Wait for rready (sleep on the signal, not every clock)
+                if not self.axi_rready.value:
+                    await RisingEdge(self.axi_rready)
+
+                await RisingEdge(self.clk)
+                self.axi_rvalid.value = 0
 
     async def axi_write_handler(self):
-        """Handle AXI write transactions."""
+        """
+        Handle AXI write transactions.
+
+        While the bus is idle the handler sleeps on AWVALID/WVALID rather
+        than waking up every clock cycle.
+        """
         while True:
-            await RisingEdge(self.dut.clk)
+            await RisingEdge(self.clk)
 
-            if self.dut.axi_awvalid.value == 1 and self.dut.axi_wvalid.value == 1:
-                self.dut.axi_awready.value = 1
-                self.dut.axi_wready.value = 1
-                addr = int(self.dut.axi_awaddr.value)
-                data = int(self.dut.axi_wdata.value)
-                await RisingEdge(self.dut.clk)
-                self.dut.axi_awready.value = 0
-                self.dut.axi_wready.value = 0
+            # Sleep until both address and data are offered
+            if not self.axi_awvalid.value:
+                await RisingEdge(self.axi_awvalid)
+            elif not self.axi_wvalid.value:
+                await RisingEdge(self.axi_wvalid)
+            else:
+                self.axi_awready.value = 1
+                self.axi_wready.value = 1
+                addr = int(self.axi_awaddr.value)
+                data = int(self.axi_wdata.value)
+                await RisingEdge(self.clk)
+                self.axi_awready.value = 0
+                self.axi_wready.value = 0
 
                 # Write to memory
                 self.write_word(addr, data)
 
-                # Response phase
-                self.dut.axi_bvalid.value = 1
-                self.dut.axi_bresp.value = 0
-
-                while self.dut.axi_bready.value == 0:
-                    await RisingEdge(self.dut.clk)
-
-                await RisingEdge(self.dut.clk)
-                self.dut.axi_bvalid.value = 0
+                # Response phase (after the AW/W handshakes, as AXI requires)
+                self.axi_bvalid.value = 1
+                self.axi_bresp.value = 0
 
+                # Wait for bready (sleep on the signal, not every clock)
+                if not self.axi_bready.value:
+                    await RisingEdge(self.axi_bready)
 
-async def reset_dut(dut):
-    """Apply reset to DUT."""
-    dut.rst_n.value = 0
-    dut.axi_arready.value = 0
-    dut.axi_rvalid.value = 0
-    dut.axi_rdata.value = 0
-    dut.axi_rresp.value = 0
-    dut.axi_awready.value = 0
-    dut.axi_wready.value = 0
-    dut.axi_bvalid.value = 0
-    dut.axi_bresp.value = 0
-    dut.apb_psel.value = 0
-    dut.apb_penable.value = 0
-    dut.apb_pwrite.value = 0
-    dut.apb_paddr.value = 0
-    dut.apb_pwdata.value = 0
-
-    await ClockCycles(dut.clk, 5)
-    dut.rst_n.value = 1
-    await ClockCycles(dut.clk, 2)
+                await RisingEdge(self.clk)
+                self.axi_bvalid.value = 0
 
 
 @cocotb.test()
@@ -213,6 +300,8 @@ async def test_ebreak_instruction(dut):
     # Reset DUT
     await reset_dut(dut)
 
+    # Log calls use deferred %-formatting so nothing is formatted when
+    # INFO is filtered out in batch regressions
     dut._log.info("=" * 80)
     dut._log.info("EBREAK HALT TEST")
     dut._log.info("=" * 80)
@@ -224,7 +313,7 @@ async def test_ebreak_instruction(dut):
     # Load EBREAK instruction at address 0x0000
     # EBREAK encoding: 0x00100073
     ebreak_insn = 0x00100073
-    dut._log.info(f"Loading EBREAK instruction (0x{ebreak_insn:08x}) at address 0x0000")
+    dut._log.info("Loading EBREAK instruction (0x%08x) at address 0x0000", ebreak_insn)
     memory.write_word(0x00000000, ebreak_insn)
 
     # Halt CPU
@@ -232,9 +321,9 @@ async def test_ebreak_instruction(dut):
     await dbg.halt_cpu()
 
     # Verify halted
-    status = await dbg.apb_read(dbg.DBG_STATUS)
+    status = await dbg.apb_read(DBG_STATUS)
     assert status & 0x1, "CPU should be halted"
-    dut._log.info(f"CPU halted (status=0x{status:08x})")
+    dut._log.info("CPU halted (status=0x%08x)", status)
 
     # Set PC to 0x0000
     dut._log.info("Setting PC to 0x00000000")
@@ -242,54 +331,71 @@ async def test_ebreak_instruction(dut):
 
     # Read back PC to verify
     pc_val = await dbg.read_pc()
-    dut._log.info(f"PC readback: 0x{pc_val:08x}")
+    dut._log.info("PC readback: 0x%08x", pc_val)
     assert pc_val == 0x00000000, f"PC should be 0x00000000, got 0x{pc_val:08x}"
 
     # Clear halted status for clean test
     dut._log.info("Resuming CPU to execute EBREAK...")
     await dbg.resume_cpu()
 
-    # Wait for CPU to halt (max 100 cycles)
+    # Wait for CPU to halt (max 100 cycles). Sleep on the internal
+    # dbg_halted flag when the simulator exposes it (Verilator with
+    # --public-flat-rw); otherwise poll DBG_STATUS with exponential
+    # backoff (1, 2, 4, ... 16 cycles) since EBREAK halts within a few.
     dut._log.info("Waiting for CPU to halt from EBREAK...")
-    halted = False
-    for cycle in range(100):
-        await RisingEdge(dut.clk)
-
-        # Check halted status
-        status = await dbg.apb_read(dbg.DBG_STATUS)
-        if status & 0x1:  # Halted bit
-            halted = True
-            halt_cause = (status >> 4) & 0xF
-            dut._log.info(f"CPU halted after {cycle} cycles")
-            dut._log.info(f"Status register: 0x{status:08x}")
-            dut._log.info(f"Halt cause: 0x{halt_cause:x}")
-
-            # Check halt cause
-            # Per MEMORY_MAP.md:
-            # 0x1 = Debug halt request
-            # 0x8 = EBREAK instruction
-            if halt_cause == 0x8:
-                dut._log.info("✓ CPU halted due to EBREAK (cause=0x8)")
-            else:
-                dut._log.warning(f"✗ CPU halted but cause is 0x{halt_cause:x}, expected 0x8 (EBREAK)")
+    dbg_halted = dbg.dbg_halted
 
-            break
+    halted = False
+    if dbg_halted is not None:
+        if not dbg_halted.value:
+            await First(RisingEdge(dbg_halted), ClockCycles(dut.clk, 100))
+        status = await dbg.apb_read(DBG_STATUS)
+        halted = bool(status & 0x1)
+    else:
+        apb_read = dbg.apb_read
+        delay = 1
+        waited = 0
+        while waited < 100:
+            await ClockCycles(dut.clk, delay)
+            waited += delay
+
+            # Check halted status
+            status = await apb_read(DBG_STATUS)
+            if status & 0x1:  # Halted bit
+                halted = True
+                dut._log.info("CPU halted within %d cycles", waited)
+                break
+            delay = min(delay * 2, 16)
+
+    if halted:
+        halt_cause = (status >> 4) & 0xF
+        dut._log.info("Status register: 0x%08x", status)
+        dut._log.info("Halt cause: 0x%x", halt_cause)
+
+        # Check halt cause
+        # Per MEMORY_MAP.md:
+        # 0x1 = Debug halt request
+        # 0x8 = EBREAK instruction
+        if halt_cause == 0x8:
+            dut._log.info("✓ CPU halted due to EBREAK (cause=0x8)")
+        else:
+            dut._log.warning("✗ CPU halted but cause is 0x%x, expected 0x8 (EBREAK)", halt_cause)
 
     # Verify CPU actually halted
     assert halted, "CPU should have halted after EBREAK instruction within 100 cycles"
 
     # Read PC to see where it stopped
     final_pc = await dbg.read_pc()
-    dut._log.info(f"Final PC: 0x{final_pc:08x}")
+    dut._log.info("Final PC: 0x%08x", final_pc)
 
     # Read the instruction that was executed
-    final_insn = await dbg.apb_read(dbg.DBG_INSTR)
-    dut._log.info(f"Final instruction: 0x{final_insn:08x}")
+    final_insn = await dbg.apb_read(DBG_INSTR)
+    dut._log.info("Final instruction: 0x%08x", final_insn)
 
     if final_insn == ebreak_insn:
         dut._log.info("✓ EBREAK instruction was executed")
     else:
-        dut._log.warning(f"✗ Expected EBREAK (0x{ebreak_insn:08x}), got 0x{final_insn:08x}")
+        dut._log.warning("✗ Expected EBREAK (0x%08x), got 0x%08x", ebreak_insn, final_insn)
 
     dut._log.info("=" * 80)
     dut._log.info("EBREAK TEST COMPLETE")
@@ -4,26 +4,24 @@ Executes 10,000+ random instructions with scoreboard validation.
 """
 
 import cocotb
-from cocotb.triggers import RisingEdge, ClockCycles
-from cocotb.clock import Clock
-import sys
+from cocotb.triggers import RisingEdge, ClockCycles, First
 import os
 from pathlib import Path
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-
 from tb.models.rv32i_model import RV32IModel
 from tb.cocotb.common.scoreboard import CPUScoreboard
 from tb.generators.rv32i_instr_gen import RV32IInstructionGenerator
 
+from tb.cocotb.common.clock_reset import setup_clock
+from tb.cocotb.cpu._common import reset_dut
+
 # Import infrastructure from test_smoke.py
 from tb.cocotb.cpu.test_smoke import (
-    reset_dut, APBDebugInterface, SimpleAXIMemory, monitor_commits
+    APBDebugInterface, SimpleAXIMemory, monitor_commits
 )
 
 
-async def run_single_seed(dut, seed, num_instructions, mem=None):
+async def run_single_seed(dut, seed, num_instructions, mem=None, dbg=None):
     """
     Run a single random instruction test with given seed.
 
@@ -42,6 +40,7 @@ async def run_single_seed(dut, seed, num_instructions, mem=None):
         seed: Random seed for reproducibility
         num_instructions: Number of instructions to generate
         mem: Optional SimpleAXIMemory instance to reuse (avoids spawning duplicate handlers)
+        dbg: Optional APBDebugInterface instance to reuse (avoids re-resolving handles)
 
     Raises:
         RuntimeError: If timeout or scoreboard validation fails
@@ -63,30 +62,32 @@ async def run_single_seed(dut, seed, num_instructions, mem=None):
         mem = SimpleAXIMemory(dut, ref_model=ref_model)
     else:
         # Reuse existing memory, reset state for new seed
-        mem.mem.clear()  # Clear memory buffer
+        mem.clear()  # Clear memory buffer
         mem.ref_model = ref_model  # Update reference model
 
     # Load program into memory
     dut._log.info(f"Seed {seed}: Loading {len(program)} instructions into memory...")
-    for addr, insn in program:
-        mem.write_word(addr, insn)
+    mem.load_program(program)
 
     # Reset CPU
     await reset_dut(dut)
 
-    # Initialize debug interface
-    dbg = APBDebugInterface(dut)
+    # Initialize debug interface (stateless, so a shared one can be reused)
+    if dbg is None:
+        dbg = APBDebugInterface(dut)
 
     # Halt CPU first (in case it's running after reset)
     await dbg.halt_cpu()
 
+    # Initialize registers and set PC to program start in one APB burst
     dut._log.info(f"Seed {seed}: Initializing registers...")
-    for reg_num, value in init_regs.items():
-        await dbg.write_gpr(reg_num, value)
-        ref_model.regs[reg_num] = value  # Sync reference model
+    writes = [(dbg.DBG_GPR_BASE + (reg_num * 4), value) for reg_num, value in init_regs.items()]
+    writes.append((dbg.DBG_PC, gen.config.instr_mem_base))
+    await dbg.apb_write_burst(writes)
 
-    # Set PC to program start
-    await dbg.apb_write(dbg.DBG_PC, gen.config.instr_mem_base)
+    # Sync reference model
+    for reg_num, value in init_regs.items():
+        ref_model.regs[reg_num] = value
     ref_model.pc = gen.config.instr_mem_base
 
     # Start commit monitor (store task handle for cleanup)
@@ -101,18 +102,27 @@ async def run_single_seed(dut, seed, num_instructions, mem=None):
     timeout_cycles = num_instructions * 20  # Conservative timeout
     dut._log.info(f"Seed {seed}: Waiting for completion (timeout={timeout_cycles} cycles)...")
 
-    for cycle in range(timeout_cycles):
-        await RisingEdge(dut.clk)
-
-        # Check if CPU halted (EBREAK reached)
-        status = await dbg.apb_read(dbg.DBG_STATUS)
-        if status & 0x1:  # HALTED bit
-            dut._log.info(f"Seed {seed}: CPU halted after {cycle} cycles")
-            break
+    if dbg.dbg_halted is not None:
+        # Sleep until the halt edge (EBREAK reached) instead of polling STATUS
+        timeout = ClockCycles(dut.clk, timeout_cycles)
+        if await First(RisingEdge(dbg.dbg_halted), timeout) is timeout:
+            # Cancel monitor before raising exception
+            monitor_task.kill()
+            raise RuntimeError(f"Seed {seed}: CPU did not halt (timeout after {timeout_cycles} cycles)")
+        dut._log.info(f"Seed {seed}: CPU halted")
     else:
-        # Cancel monitor before raising exception
-        monitor_task.kill()
-        raise RuntimeError(f"Seed {seed}: CPU did not halt (timeout after {timeout_cycles} cycles)")
+        for cycle in range(timeout_cycles):
+            await RisingEdge(dut.clk)
+
+            # Check if CPU halted (EBREAK reached)
+            status = await dbg.apb_read(dbg.DBG_STATUS)
+            if status & 0x1:  # HALTED bit
+                dut._log.info(f"Seed {seed}: CPU halted after {cycle} cycles")
+                break
+        else:
+            # Cancel monitor before raising exception
+            monitor_task.kill()
+            raise RuntimeError(f"Seed {seed}: CPU did not halt (timeout after {timeout_cycles} cycles)")
 
     # Give scoreboard time to process final commits
     await ClockCycles(dut.clk, 5)
@@ -125,6 +135,14 @@ async def run_single_seed(dut, seed, num_instructions, mem=None):
     passed = scoreboard.report()
 
     if not passed:
+        # Snapshot final register state for debugging (one APB burst)
+        regs = await dbg.dump_registers()
+        dut._log.error(
+            "Final register state:\n" + "\n".join(
+                "  " + "  ".join(f"x{r:<2}=0x{regs[r]:08x}" for r in range(n, n + 4))
+                for n in range(0, 32, 4)
+            )
+        )
         raise RuntimeError(f"Seed {seed}: Scoreboard validation failed")
 
     dut._log.info(f"Seed {seed}: PASSED ({commit_count[0]} instructions committed)")
@@ -139,8 +157,7 @@ async def test_random_instructions_multi_seed(dut):
     execution against the reference model via scoreboard.
     """
     # Start clock
-    clock = Clock(dut.clk, 10, unit="ns")
-    cocotb.start_soon(clock.start())
+    await setup_clock(dut)
 
     # Configuration
     NUM_SEEDS = 100
@@ -165,6 +182,7 @@ async def test_random_instructions_multi_seed(dut):
     # Initial ref_model will be replaced per seed
     initial_ref_model = RV32IModel()
     shared_mem = SimpleAXIMemory(dut, ref_model=initial_ref_model)
+    shared_dbg = APBDebugInterface(dut)
 
     for i, seed in enumerate(random_seeds):
         dut._log.info("="*70)
@@ -172,8 +190,8 @@ async def test_random_instructions_multi_seed(dut):
         dut._log.info("="*70)
 
         try:
-            # Run single seed test with shared memory instance
-            await run_single_seed(dut, seed, INSTRUCTIONS_PER_SEED, mem=shared_mem)
+            # Run single seed test with shared memory and debug instances
+            await run_single_seed(dut, seed, INSTRUCTIONS_PER_SEED, mem=shared_mem, dbg=shared_dbg)
             passing_seeds.append(seed)
 
         except Exception as e:
@@ -220,8 +238,7 @@ async def test_random_instructions_single_seed(dut):
         RANDOM_SEED=42 make test TEST_MODULE=tb.cocotb.cpu.test_random_instructions TEST=test_random_instructions_single_seed
     """
     # Start clock
-    clock = Clock(dut.clk, 10, unit="ns")
-    cocotb.start_soon(clock.start())
+    await setup_clock(dut)
 
     # Get seed from environment variable
     SEED = int(os.environ.get("RANDOM_SEED", "42"))
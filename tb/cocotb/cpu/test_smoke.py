@@ -4,40 +4,21 @@ Basic functionality tests to verify CPU is operational.
 """
 
 import cocotb
-from cocotb.triggers import RisingEdge, Timer, ClockCycles, ReadOnly, NextTimeStep
-from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, FallingEdge, Timer, ClockCycles, ReadOnly, NextTimeStep, First
 from cocotb.queue import Queue
-import sys
-from pathlib import Path
 import asyncio
-
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+import struct
 
 from tb.models.rv32i_model import RV32IModel
-from tb.cocotb.common.scoreboard import CPUScoreboard
-
-
-async def reset_dut(dut):
-    """Apply reset to DUT."""
-    dut.rst_n.value = 0
-    dut.axi_arready.value = 0
-    dut.axi_rvalid.value = 0
-    dut.axi_rdata.value = 0
-    dut.axi_rresp.value = 0
-    dut.axi_awready.value = 0
-    dut.axi_wready.value = 0
-    dut.axi_bvalid.value = 0
-    dut.axi_bresp.value = 0
-    dut.apb_psel.value = 0
-    dut.apb_penable.value = 0
-    dut.apb_pwrite.value = 0
-    dut.apb_paddr.value = 0
-    dut.apb_pwdata.value = 0
-
-    await ClockCycles(dut.clk, 5)
-    dut.rst_n.value = 1
-    await ClockCycles(dut.clk, 2)
+from tb.cocotb.common.scoreboard import Commit, CPUScoreboard
+from tb.cocotb.common.clock_reset import setup_clock
+from tb.cocotb.cpu._common import apb_write_burst, reset_dut
+
+# Little-endian 32-bit word packer for SimpleAXIMemory; the bound methods
+# are hoisted so read_word/write_word make a single C call per access
+_WORD = struct.Struct("<I")
+_pack_word = _WORD.pack_into
+_unpack_word = _WORD.unpack_from
 
 
 class APBDebugInterface:
@@ -52,68 +33,148 @@ class APBDebugInterface:
 
     def __init__(self, dut):
         self.dut = dut
+        # Cache signal handles; each dut.<name> lookup walks the hierarchy
+        self.clk = dut.clk
+        self.apb_psel = dut.apb_psel
+        self.apb_penable = dut.apb_penable
+        self.apb_pwrite = dut.apb_pwrite
+        self.apb_paddr = dut.apb_paddr
+        self.apb_pwdata = dut.apb_pwdata
+        self.apb_prdata = dut.apb_prdata
+        # Internal halted flag, if the simulator exposes it (e.g. Verilator
+        # built with --public-flat-rw); lets halt/resume skip STATUS polling
+        try:
+            self.dbg_halted = dut.dbg_halted
+        except AttributeError:
+            self.dbg_halted = None
 
     async def apb_write(self, addr, data):
         """Write to APB debug register."""
-        await RisingEdge(self.dut.clk)
-        self.dut.apb_psel.value = 1
-        self.dut.apb_penable.value = 0
-        self.dut.apb_pwrite.value = 1
-        self.dut.apb_paddr.value = addr
-        self.dut.apb_pwdata.value = data
-
-        await RisingEdge(self.dut.clk)
-        self.dut.apb_penable.value = 1
-
-        await RisingEdge(self.dut.clk)
-        self.dut.apb_psel.value = 0
-        self.dut.apb_penable.value = 0
-        self.dut.apb_pwrite.value = 0
+        await RisingEdge(self.clk)
+        # SETUP phase (PENABLE is already low in IDLE)
+        self.apb_psel.value = 1
+        self.apb_pwrite.value = 1
+        self.apb_paddr.value = addr
+        self.apb_pwdata.value = data
+
+        await RisingEdge(self.clk)
+        self.apb_penable.value = 1
+
+        await RisingEdge(self.clk)
+        self.apb_psel.value = 0
+        self.apb_penable.value = 0
+        self.apb_pwrite.value = 0
+
+    async def apb_write_burst(self, writes):
+        """
+        Write several APB debug registers back-to-back.
+
+        PSEL stays asserted and each ACCESS phase goes straight into the next
+        SETUP phase, so each write costs two clock cycles instead of three.
+
+        Args:
+            writes: Iterable of (addr, data) pairs, written in order
+        """
+        await RisingEdge(self.clk)
+        await apb_write_burst(self.dut, writes)
 
     async def apb_read(self, addr):
         """Read from APB debug register."""
-        # Setup phase
-        await RisingEdge(self.dut.clk)
-        self.dut.apb_psel.value = 1
-        self.dut.apb_penable.value = 0
-        self.dut.apb_pwrite.value = 0
-        self.dut.apb_paddr.value = addr
+        # Setup phase (PENABLE and PWRITE are already low in IDLE)
+        await RisingEdge(self.clk)
+        self.apb_psel.value = 1
+        self.apb_paddr.value = addr
 
         # Access phase
-        await RisingEdge(self.dut.clk)
-        self.dut.apb_penable.value = 1
+        await RisingEdge(self.clk)
+        self.apb_penable.value = 1
 
         # Read data during access phase (when penable=1 and pready=1)
         await ReadOnly()  # Wait for signals to settle
-        data = int(self.dut.apb_prdata.value)
+        data = int(self.apb_prdata.value)
 
         # End transfer
-        await RisingEdge(self.dut.clk)
-        self.dut.apb_psel.value = 0
-        self.dut.apb_penable.value = 0
+        await RisingEdge(self.clk)
+        self.apb_psel.value = 0
+        self.apb_penable.value = 0
 
         return data
 
+    async def _wait_halted(self, halted, timeout_cycles=100):
+        """Wait on the internal dbg_halted edge; returns False on timeout."""
+        if bool(self.dbg_halted.value) == halted:
+            return True
+        edge = RisingEdge(self.dbg_halted) if halted else FallingEdge(self.dbg_halted)
+        timeout = ClockCycles(self.clk, timeout_cycles)
+        return await First(edge, timeout) is not timeout
+
+    async def apb_read_burst(self, addrs):
+        """
+        Read several APB debug registers back-to-back.
+
+        PSEL stays asserted and each ACCESS phase goes straight into the next
+        SETUP phase, so each read costs two clock cycles instead of three.
+        """
+        results = []
+
+        await RisingEdge(self.clk)
+        self.apb_psel.value = 1
+
+        for addr in addrs:
+            # Setup phase
+            self.apb_penable.value = 0
+            self.apb_paddr.value = addr
+
+            # Access phase
+            await RisingEdge(self.clk)
+            self.apb_penable.value = 1
+
+            await ReadOnly()  # Wait for signals to settle
+            results.append(int(self.apb_prdata.value))
+
+            await RisingEdge(self.clk)
+
+        # End transfer
+        self.apb_psel.value = 0
+        self.apb_penable.value = 0
+
+        return results
+
+    async def dump_registers(self):
+        """Read x0-x31 in a single APB burst (CPU must be halted)."""
+        # x0 is hardwired to zero, so only x1-x31 go over the bus
+        return [0] + await self.apb_read_burst(
+            [self.DBG_GPR_BASE + (n * 4) for n in range(1, 32)]
+        )
+
     async def halt_cpu(self):
         """Halt the CPU via debug interface."""
         await self.apb_write(self.DBG_CTRL, 0x1)  # HALT_REQ
+        if self.dbg_halted is not None:
+            if not await self._wait_halted(True):
+                raise RuntimeError("CPU did not halt")
+            return
         # Wait for CPU to halt
         for _ in range(10):
             status = await self.apb_read(self.DBG_STATUS)
             if status & 0x1:  # HALTED bit
                 return
-            await RisingEdge(self.dut.clk)
+            await RisingEdge(self.clk)
         raise RuntimeError("CPU did not halt")
 
     async def resume_cpu(self):
         """Resume the CPU via debug interface."""
         await self.apb_write(self.DBG_CTRL, 0x2)  # RESUME_REQ
+        if self.dbg_halted is not None:
+            if not await self._wait_halted(False):
+                raise RuntimeError("CPU did not resume")
+            return
         # Wait for CPU to resume
         for _ in range(10):
             status = await self.apb_read(self.DBG_STATUS)
             if status & 0x2:  # RUNNING bit
                 return
-            await RisingEdge(self.dut.clk)
+            await RisingEdge(self.clk)
         raise RuntimeError("CPU did not resume")
 
     async def read_gpr(self, reg_num):
@@ -132,87 +193,169 @@ class APBDebugInterface:
 
 
 class SimpleAXIMemory:
-    """Simple AXI4-Lite memory model for testing."""
+    """Simple AXI4-Lite memory model for testing.
+
+    Backed by a flat little-endian bytearray (64 KB by default, covering the
+    instruction and data regions used by the generator).
+    """
 
-    def __init__(self, dut, ref_model=None):
+    def __init__(self, dut, ref_model=None, mem_size=0x10000):
         self.dut = dut
-        self.mem = {}
+        self.mem = bytearray(mem_size)
+        # Cache signal handles; each dut.<name> lookup walks the hierarchy
+        self.clk = dut.clk
+        self.axi_araddr = dut.axi_araddr
+        self.axi_arready = dut.axi_arready
+        self.axi_arvalid = dut.axi_arvalid
+        self.axi_awaddr = dut.axi_awaddr
+        self.axi_awready = dut.axi_awready
+        self.axi_awvalid = dut.axi_awvalid
+        self.axi_bready = dut.axi_bready
+        self.axi_bresp = dut.axi_bresp
+        self.axi_bvalid = dut.axi_bvalid
+        self.axi_rdata = dut.axi_rdata
+        self.axi_rready = dut.axi_rready
+        self.axi_rresp = dut.axi_rresp
+        self.axi_rvalid = dut.axi_rvalid
+        self.axi_wdata = dut.axi_wdata
+        self.axi_wready = dut.axi_wready
+        self.axi_wvalid = dut.axi_wvalid
         self.read_count = 0
         self.ref_model = ref_model  # Optional reference model to keep in sync
         cocotb.start_soon(self.axi_read_handler())
         cocotb.start_soon(self.axi_write_handler())
 
+    def clear(self):
+        """Zero the whole memory."""
+        self.mem = bytearray(len(self.mem))
+
     def write_word(self, addr, data):
         """Write 32-bit word to memory."""
-        self.mem[addr & 0xFFFFFFFC] = data & 0xFFFFFFFF
+        addr &= 0xFFFFFFFC
+        if addr + 4 > len(self.mem):
+            raise IndexError(f"Write to 0x{addr:08x} outside {len(self.mem)}-byte memory")
+        _pack_word(self.mem, addr, data & 0xFFFFFFFF)
         # Also write to reference model memory if available
         if self.ref_model is not None:
-            self.ref_model.memory.write(addr & 0xFFFFFFFC, data & 0xFFFFFFFF, 4)
+            self.ref_model.memory.write(addr, data & 0xFFFFFFFF, 4)
+
+    def load_program(self, program):
+        """
+        Load a list of (addr, word) pairs into memory.
+
+        A contiguous, word-aligned program (the common case from the
+        instruction generator) is packed into the buffer in a single slice
+        assignment; anything else falls back to per-word writes.
+        """
+        if not program:
+            return
+
+        base = program[0][0]
+        words = [insn & 0xFFFFFFFF for _, insn in program]
+        end = base + 4 * len(words)
+        contiguous = base % 4 == 0 and all(
+            addr == base + 4 * i for i, (addr, _) in enumerate(program)
+        )
+        if not contiguous or end > len(self.mem):
+            for addr, insn in program:
+                self.write_word(addr, insn)
+            return
+
+        self.mem[base:end] = struct.pack(f"<{len(words)}I", *words)
+        if self.ref_model is not None:
+            self.ref_model.memory.load_program(dict(program))
 
     def read_word(self, addr):
-        """Read 32-bit word from memory."""
-        return self.mem.get(addr & 0xFFFFFFFC, 0)
+        """Read 32-bit word from memory (unmapped addresses read as 0)."""
+        addr &= 0xFFFFFFFC
+        if addr + 4 > len(self.mem):
+            return 0
+        return _unpack_word(self.mem, addr)[0]
+
+    def read_words(self, addr, count):
+        """Read count consecutive 32-bit words starting at addr in one call."""
+        addr &= 0xFFFFFFFC
+        mapped = max(0, min(count, (len(self.mem) - addr) // 4))
+        words = list(struct.unpack_from(f"<{mapped}I", self.mem, addr)) if mapped else []
+        # Unmapped words read as 0, like read_word()
+        return words + [0] * (count - mapped)
 
     async def axi_read_handler(self):
-        """Handle AXI read transactions - simplified sequential version."""
+        """
+        Handle AXI read transactions - simplified sequential version.
+
+        While the bus is idle the handler sleeps on ARVALID rather than
+        waking up every clock cycle.
+        """
         while True:
-            await RisingEdge(self.dut.clk)
+            await RisingEdge(self.clk)
 
-            if self.dut.axi_arvalid.value == 1:
+            if not self.axi_arvalid.value:
+                self.axi_arready.value = 0
+                await RisingEdge(self.axi_arvalid)
+            else:
                 # Accept address
-                self.dut.axi_arready.value = 1
-                addr = int(self.dut.axi_araddr.value)
+                self.axi_arready.value = 1
+                addr = int(self.axi_araddr.value)
                 data = self.read_word(addr)
                 self.read_count += 1
 
                 if self.read_count <= 5:
-                    self.dut._log.info(f"AXI Read #{self.read_count}: addr=0x{addr:08x} data=0x{data:08x}")
+                    self.dut._log.info("AXI Read #%d: addr=0x%08x data=0x%08x", self.read_count, addr, data)
 
                 # Provide data on next cycle
-                await RisingEdge(self.dut.clk)
-                self.dut.axi_arready.value = 0
-                self.dut.axi_rvalid.value = 1
-                self.dut.axi_rdata.value = data
-                self.dut.axi_rresp.value = 0
-
-                # Wait for rready
-                while self.dut.axi_rready.value == 0:
-                    await RisingEdge(self.dut.clk)
-
-                await RisingEdge(self.dut.clk)
-                self.dut.axi_rvalid.value = 0
-            else:
-                self.dut.axi_arready.value = 0
+                await RisingEdge(self.clk)
+                self.axi_arready.value = 0
+                self.axi_rvalid.value = 1
+                self.axi_rdata.value = data
+                self.axi_rresp.value = 0
+
+                # Wait for rready (sleep on the signal, not every clock)
+                if not self.axi_rready.value:
+                    await RisingEdge(self.axi_rready)
+
+                await RisingEdge(self.clk)
+                self.axi_rvalid.value = 0
 
     async def axi_write_handler(self):
-        """Handle AXI write transactions with proper handshaking."""
+        """
+        Handle AXI write transactions with proper handshaking.
+
+        While the bus is idle the handler sleeps on AWVALID/WVALID rather
+        than waking up every clock cycle.
+        """
         while True:
-            await RisingEdge(self.dut.clk)
-
-            # Address and data phases (can be simultaneous)
-            if self.dut.axi_awvalid.value == 1 and self.dut.axi_wvalid.value == 1 and self.dut.axi_awready.value == 0:
-                self.dut.axi_awready.value = 1
-                self.dut.axi_wready.value = 1
-                addr = int(self.dut.axi_awaddr.value)
-                data = int(self.dut.axi_wdata.value)
-                await RisingEdge(self.dut.clk)
-                self.dut.axi_awready.value = 0
-                self.dut.axi_wready.value = 0
+            await RisingEdge(self.clk)
+
+            # Sleep until both address and data are offered
+            if not self.axi_awvalid.value:
+                await RisingEdge(self.axi_awvalid)
+            elif not self.axi_wvalid.value:
+                await RisingEdge(self.axi_wvalid)
+            elif not self.axi_awready.value:
+                # Address and data phases (can be simultaneous)
+                self.axi_awready.value = 1
+                self.axi_wready.value = 1
+                addr = int(self.axi_awaddr.value)
+                data = int(self.axi_wdata.value)
+                await RisingEdge(self.clk)
+                self.axi_awready.value = 0
+                self.axi_wready.value = 0
 
                 # Write to memory
                 self.write_word(addr, data)
 
                 # Response phase - assert bvalid and wait for bready
-                self.dut.axi_bvalid.value = 1
-                self.dut.axi_bresp.value = 0  # OKAY
+                self.axi_bvalid.value = 1
+                self.axi_bresp.value = 0  # OKAY
 
                 # Wait for CPU to assert bready (proper AXI handshake)
-                while self.dut.axi_bready.value == 0:
-                    await RisingEdge(self.dut.clk)
+                if not self.axi_bready.value:
+                    await RisingEdge(self.axi_bready)
 
                 # Handshake complete - de-assert bvalid on next cycle
-                await RisingEdge(self.dut.clk)
-                self.dut.axi_bvalid.value = 0
+                await RisingEdge(self.clk)
+                self.axi_bvalid.value = 0
 
 
 @cocotb.test()
@@ -221,8 +364,7 @@ async def test_reset(dut):
     dut._log.info("=== Test: Reset ===")
 
     # Start clock
-    clock = Clock(dut.clk, 10, unit="ns")
-    cocotb.start_soon(clock.start())
+    await setup_clock(dut)
 
     # Apply reset
     await reset_dut(dut)
@@ -239,8 +381,7 @@ async def test_fetch_nop(dut):
     dut._log.info("=== Test: Fetch NOP ===")
 
     # Start clock
-    clock = Clock(dut.clk, 10, unit="ns")
-    cocotb.start_soon(clock.start())
+    await setup_clock(dut)
 
     # Initialize reference model and scoreboard
     ref_model = RV32IModel()
@@ -280,35 +421,47 @@ async def monitor_commits(dut, scoreboard=None, count=[0]):
     NOTE: Currently performs basic PC/instruction validation only.
     Full register write validation requires additional RTL signals
     (commit_rd, commit_rd_we, commit_rd_data) which will be added later.
+
+    commit_valid is a one-cycle pulse in WRITEBACK, so the monitor sleeps
+    until its rising edge instead of waking up on every clock. Once the
+    first 10 commits have been logged, commits are only counted (without
+    sampling commit_pc/commit_insn) when no scoreboard is attached.
+
+    A single Commit record is reused for every scoreboard check; the
+    scoreboard only reads it during check_commit() and never keeps it.
     """
+    # For now, we only check PC and instruction matching
+    # Full validation (rd, rd_value, mem_addr, etc.) requires
+    # additional commit signals from RTL
+    rtl_commit = Commit()
+
+    # Bind handles once instead of resolving them on every commit
+    commit_valid = dut.commit_valid
+    commit_pc = dut.commit_pc
+    commit_insn = dut.commit_insn
+
     while True:
-        await RisingEdge(dut.clk)
-        if dut.commit_valid.value == 1:
-            count[0] += 1
-            pc = int(dut.commit_pc.value)
-            insn = int(dut.commit_insn.value)
-
-            # Log first 10 commits
-            if count[0] <= 10:
-                dut._log.info(f"Commit #{count[0]}: PC=0x{pc:08x}, insn=0x{insn:08x}")
-
-            # Validate against scoreboard if provided
-            if scoreboard is not None:
-                # For now, we only check PC and instruction matching
-                # Full validation (rd, rd_value, mem_addr, etc.) requires
-                # additional commit signals from RTL
-                rtl_commit = {
-                    'pc': pc,
-                    'insn': insn,
-                    'rd': None,
-                    'rd_value': None,
-                    'mem_addr': None,
-                    'mem_data': None,
-                    'mem_write': None
-                }
-
-                # Check against scoreboard (basic validation)
-                scoreboard.check_commit(rtl_commit)
+        await RisingEdge(commit_valid)
+
+        count[0] += 1
+        if scoreboard is None and count[0] > 10:
+            continue  # Nothing consumes the commit data
+
+        await ReadOnly()  # Let commit_pc/commit_insn settle before sampling
+        pc = int(commit_pc.value)
+        insn = int(commit_insn.value)
+
+        # Log first 10 commits
+        if count[0] <= 10:
+            dut._log.info("Commit #%d: PC=0x%08x, insn=0x%08x", count[0], pc, insn)
+
+        # Validate against scoreboard if provided
+        if scoreboard is not None:
+            rtl_commit.pc = pc
+            rtl_commit.insn = insn
+
+            # Check against scoreboard (basic validation)
+            scoreboard.check_commit(rtl_commit)
 
 
 @cocotb.test()
@@ -317,8 +470,7 @@ async def test_simple_addi(dut):
     dut._log.info("=== Test: Simple ADDI ===")
 
     # Start clock
-    clock = Clock(dut.clk, 10, unit="ns")
-    cocotb.start_soon(clock.start())
+    await setup_clock(dut)
 
     # Initialize reference model and scoreboard
     ref_model = RV32IModel()
@@ -386,8 +538,7 @@ async def test_branch_not_taken(dut):
     dut._log.info("=== Test: Branch Not Taken ===")
 
     # Start clock
-    clock = Clock(dut.clk, 10, unit="ns")
-    cocotb.start_soon(clock.start())
+    await setup_clock(dut)
 
     # Initialize reference model and scoreboard
     ref_model = RV32IModel()
@@ -457,8 +608,7 @@ async def test_branch_taken(dut):
     dut._log.info("=== Test: Branch Taken ===")
 
     # Start clock
-    clock = Clock(dut.clk, 10, unit="ns")
-    cocotb.start_soon(clock.start())
+    await setup_clock(dut)
 
     # Initialize reference model and scoreboard
     ref_model = RV32IModel()
@@ -535,8 +685,7 @@ async def test_jal(dut):
     dut._log.info("=== Test: JAL ===")
 
     # Start clock
-    clock = Clock(dut.clk, 10, unit="ns")
-    cocotb.start_soon(clock.start())
+    await setup_clock(dut)
 
     # Initialize reference model and scoreboard
     ref_model = RV32IModel()
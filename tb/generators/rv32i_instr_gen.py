@@ -6,6 +6,7 @@ Generates constrained random instruction sequences for stress testing.
 
 import random
 import sys
+from itertools import accumulate
 from pathlib import Path
 
 # Add project root to path
@@ -56,6 +57,18 @@ class RV32IInstructionGenerator:
     - EBREAK termination for clean program exit
     """
 
+    # Opcode tables, built once rather than per generated instruction
+    R_TYPE_OPCODES = (
+        ('ADD', enc.ADD), ('SUB', enc.SUB),
+        ('AND', enc.AND), ('OR', enc.OR), ('XOR', enc.XOR),
+        ('SLT', enc.SLT), ('SLTU', enc.SLTU),
+        ('SLL', enc.SLL), ('SRL', enc.SRL), ('SRA', enc.SRA)
+    )
+    UPPER_OPCODES = (
+        ('LUI', enc.LUI),
+        ('AUIPC', enc.AUIPC),
+    )
+
     def __init__(self, seed=None, config=None):
         """
         Initialize generator.
@@ -74,6 +87,29 @@ class RV32IInstructionGenerator:
         # Precompute register initialization values (deterministic from seed)
         self.init_regs = self._compute_init_regs()
 
+        # Instruction class selection table (refreshed per program)
+        self._update_class_weights()
+
+        # I-type table holds bound immediate generators, so build it per instance
+        self.i_type_opcodes = (
+            ('ADDI', enc.ADDI, self._random_imm12),
+            ('SLTI', enc.SLTI, self._random_imm12),
+            ('SLTIU', enc.SLTIU, self._random_imm12),
+            ('XORI', enc.XORI, self._random_imm12),
+            ('ORI', enc.ORI, self._random_imm12),
+            ('ANDI', enc.ANDI, self._random_imm12),
+            ('SLLI', enc.SLLI, self._random_shamt),
+            ('SRLI', enc.SRLI, self._random_shamt),
+            ('SRAI', enc.SRAI, self._random_shamt),
+        )
+
+    def _update_class_weights(self):
+        """Cache instruction classes and cumulative weights from the config."""
+        self._classes = list(self.config.instruction_classes.keys())
+        self._cum_weights = list(
+            accumulate(self.config.instruction_classes[c] for c in self._classes)
+        )
+
     def _compute_init_regs(self):
         """
         Compute initial register values for this test.
@@ -109,6 +145,7 @@ class RV32IInstructionGenerator:
         """
         program = []
         self.current_addr = self.config.instr_mem_base
+        self._update_class_weights()
 
         # Generate N-1 random instructions
         for i in range(num_instructions - 1):
@@ -130,9 +167,7 @@ class RV32IInstructionGenerator:
             32-bit instruction word
         """
         # Select instruction class based on weights
-        classes = list(self.config.instruction_classes.keys())
-        weights = [self.config.instruction_classes[c] for c in classes]
-        instr_class = self.rng.choices(classes, weights=weights)[0]
+        instr_class = self.rng.choices(self._classes, cum_weights=self._cum_weights)[0]
 
         # Generate instruction based on class
         if instr_class == 'r_type':
@@ -166,13 +201,7 @@ class RV32IInstructionGenerator:
 
     def _generate_r_type(self):
         """Generate random R-type instruction."""
-        opcodes = [
-            ('ADD', enc.ADD), ('SUB', enc.SUB),
-            ('AND', enc.AND), ('OR', enc.OR), ('XOR', enc.XOR),
-            ('SLT', enc.SLT), ('SLTU', enc.SLTU),
-            ('SLL', enc.SLL), ('SRL', enc.SRL), ('SRA', enc.SRA)
-        ]
-        name, encoder_func = self.rng.choice(opcodes)
+        name, encoder_func = self.rng.choice(self.R_TYPE_OPCODES)
 
         rd = self._random_dest_reg()
         rs1 = self._random_source_reg()
@@ -182,18 +211,7 @@ class RV32IInstructionGenerator:
 
     def _generate_i_type_alu(self):
         """Generate random I-type arithmetic instruction."""
-        opcodes = [
-            ('ADDI', enc.ADDI, self._random_imm12),
-            ('SLTI', enc.SLTI, self._random_imm12),
-            ('SLTIU', enc.SLTIU, self._random_imm12),
-            ('XORI', enc.XORI, self._random_imm12),
-            ('ORI', enc.ORI, self._random_imm12),
-            ('ANDI', enc.ANDI, self._random_imm12),
-            ('SLLI', enc.SLLI, self._random_shamt),
-            ('SRLI', enc.SRLI, self._random_shamt),
-            ('SRAI', enc.SRAI, self._random_shamt),
-        ]
-        name, encoder_func, imm_generator = self.rng.choice(opcodes)
+        name, encoder_func, imm_generator = self.rng.choice(self.i_type_opcodes)
 
         rd = self._random_dest_reg()
         rs1 = self._random_source_reg()
@@ -203,11 +221,7 @@ class RV32IInstructionGenerator:
 
     def _generate_upper(self):
         """Generate random upper immediate instruction (LUI/AUIPC)."""
-        opcodes = [
-            ('LUI', enc.LUI),
-            ('AUIPC', enc.AUIPC),
-        ]
-        name, encoder_func = self.rng.choice(opcodes)
+        name, encoder_func = self.rng.choice(self.UPPER_OPCODES)
 
         rd = self._random_dest_reg()
         imm20 = self._random_imm20()
@@ -5,6 +5,8 @@ Provides a simple sparse memory implementation with alignment checking.
 Conforms to REFERENCE_MODEL_SPEC.md.
 """
 
+from collections.abc import Iterable
+
 
 class MisalignedAccessError(Exception):
     """Exception raised when accessing memory with incorrect alignment."""
@@ -115,8 +117,25 @@ class MemoryModel:
             ... }
             >>> mem.load_program(program)
         """
+        if word_size not in [1, 2, 4]:
+            raise ValueError(f"Invalid size {word_size}, must be 1, 2, or 4")
+
+        # Validate and split every word up front, then store all bytes with
+        # a single dict update instead of one write() call per word
+        mask = (1 << (word_size * 8)) - 1
+        byte_items: list[tuple[int, int]] = []
         for addr, value in program.items():
-            self.write(addr, value, word_size)
+            if addr % word_size != 0:
+                raise MisalignedAccessError(
+                    f"Address 0x{addr:08x} not aligned to {word_size}-byte boundary"
+                )
+            byte_items.extend(
+                zip(
+                    range(addr, addr + word_size),
+                    (value & mask).to_bytes(word_size, "little"),
+                )
+            )
+        self.mem.update(byte_items)
 
     def dump(self, start_addr: int, end_addr: int) -> dict[int, int]:
         """
@@ -136,11 +155,13 @@ class MemoryModel:
             >>> mem.dump(0x1000, 0x1004)
             {4096: 120, 4097: 86, 4098: 52, 4099: 18}
         """
-        return {
-            addr: self.mem[addr]
-            for addr in range(start_addr, end_addr)
-            if addr in self.mem
-        }
+        # Scan whichever is smaller: the address range or the stored bytes
+        addrs: Iterable[int]
+        if end_addr - start_addr > len(self.mem):
+            addrs = sorted(a for a in self.mem if start_addr <= a < end_addr)
+        else:
+            addrs = (a for a in range(start_addr, end_addr) if a in self.mem)
+        return {addr: self.mem[addr] for addr in addrs}
 
     def clear(self):
         """Clear all memory contents."""
@@ -56,6 +56,18 @@ class RV32IModel:
         self.reset_pc = reset_pc
         self.trap_vector = trap_vector
         self.memory = MemoryModel()
+        # Opcode -> bound executor, so decode is one dict lookup per step
+        self._dispatch = {
+            self.OP_LUI: self._execute_lui,
+            self.OP_AUIPC: self._execute_auipc,
+            self.OP_JAL: self._execute_jal,
+            self.OP_JALR: self._execute_jalr,
+            self.OP_BRANCH: self._execute_branch,
+            self.OP_LOAD: self._execute_load,
+            self.OP_STORE: self._execute_store,
+            self.OP_OP_IMM: self._execute_op_imm,
+            self.OP_OP: self._execute_op,
+        }
         self.reset()
 
     def reset(self):
@@ -148,26 +160,10 @@ class RV32IModel:
         opcode = insn & 0x7F
 
         # Decode based on opcode
-        if opcode == self.OP_LUI:
-            self._execute_lui(insn, result)
-        elif opcode == self.OP_AUIPC:
-            self._execute_auipc(insn, result)
-        elif opcode == self.OP_JAL:
-            self._execute_jal(insn, result)
-        elif opcode == self.OP_JALR:
-            self._execute_jalr(insn, result)
-        elif opcode == self.OP_BRANCH:
-            self._execute_branch(insn, result)
-        elif opcode == self.OP_LOAD:
-            self._execute_load(insn, result)
-        elif opcode == self.OP_STORE:
-            self._execute_store(insn, result)
-        elif opcode == self.OP_OP_IMM:
-            self._execute_op_imm(insn, result)
-        elif opcode == self.OP_OP:
-            self._execute_op(insn, result)
-        else:
+        execute = self._dispatch.get(opcode)
+        if execute is None:
             raise IllegalInstructionError(f"Unknown opcode: 0x{opcode:02x}")
+        execute(insn, result)
 
     def _sign_extend(self, value: int, bits: int) -> int:
         """Sign extend a value from bits to 32 bits."""
@@ -126,6 +126,15 @@ class TestMemoryModel:
         assert mem.read(0x0004, 4) == 0x00100113
         assert mem.read(0x0008, 4) == 0x002081B3
 
+    def test_load_program_misaligned(self):
+        """Test load_program rejects misaligned words and stores nothing."""
+        mem = MemoryModel()
+
+        with pytest.raises(MisalignedAccessError):
+            mem.load_program({0x0000: 0x00000013, 0x0006: 0x00000013})
+
+        assert len(mem.mem) == 0
+
     def test_dump(self):
         """Test memory dump functionality."""
         mem = MemoryModel()
@@ -141,6 +150,28 @@ class TestMemoryModel:
         assert dump[0x1002] == 0x34
         assert dump[0x1003] == 0x12
 
+    def test_dump_large_range(self):
+        """Test dump over a range much larger than the stored data."""
+        mem = MemoryModel()
+
+        mem.write(0x0000, 0xAABBCCDD, 4)
+        mem.write(0x8000, 0x11223344, 4)
+        mem.write(0x20000, 0x55667788, 4)  # Outside the dumped range
+
+        dump = mem.dump(0x0000, 0x10000)
+
+        assert list(dump) == [
+            0x0000,
+            0x0001,
+            0x0002,
+            0x0003,
+            0x8000,
+            0x8001,
+            0x8002,
+            0x8003,
+        ]
+        assert dump[0x8000] == 0x44
+
     def test_clear(self):
         """Test memory clear."""
         mem = MemoryModel()
@@ -0,0 +1,163 @@
+"""
+Unit tests for CPUScoreboard.
+
+Tests commit checking, batch checking and history recording against
+the RV32I reference model (no simulator required).
+"""
+
+import logging
+
+from tb.cocotb.common.scoreboard import Commit, CommitHistory, CPUScoreboard
+from tb.models.rv32i_model import RV32IModel
+
+NOP = 0x00000013  # ADDI x0, x0, 0
+ADDI_X1_5 = 0x00500093  # ADDI x1, x0, 5
+
+
+def nop_commits(count, start_pc=0):
+    """Return count sequential NOP commits starting at start_pc."""
+    return [Commit(start_pc + 4 * i, NOP) for i in range(count)]
+
+
+class TestCommit:
+    """Test cases for the Commit record."""
+
+    def test_defaults(self):
+        """Test optional fields default to None."""
+        commit = Commit(0x100, NOP)
+        assert commit.pc == 0x100
+        assert commit.insn == NOP
+        assert commit.rd is None
+        assert commit.mem_addr is None
+
+    def test_from_dict(self):
+        """Test conversion from the legacy dict form."""
+        commit = Commit.from_dict({"pc": 0x8, "insn": ADDI_X1_5, "rd": 1})
+        assert (commit.pc, commit.insn, commit.rd) == (0x8, ADDI_X1_5, 1)
+        assert commit.rd_value is None
+
+
+class TestCommitHistory:
+    """Test cases for CommitHistory."""
+
+    def test_length_and_indexing(self):
+        """Test history length and per-column indexing."""
+        history = CommitHistory()
+        assert len(history) == 0
+
+        history.append(0x0, NOP)
+        history.append(0x4, ADDI_X1_5)
+
+        assert len(history) == 2
+        assert history.pc[1] == 0x4
+        assert history.insn[0] == NOP
+        assert history.insn[-1] == ADDI_X1_5
+        assert len(history.mismatches) == 0
+
+    def test_wraps_to_32_bits(self):
+        """Test values are stored as unsigned 32-bit words."""
+        history = CommitHistory()
+        history.append(0xFFFFFFFC, 0xFFFFFFFF)
+        assert history.pc[0] == 0xFFFFFFFC
+        assert history.insn[0] == 0xFFFFFFFF
+
+
+class TestCPUScoreboard:
+    """Test cases for CPUScoreboard."""
+
+    def test_check_commit_match(self):
+        """Test a single matching commit."""
+        sb = CPUScoreboard(RV32IModel())
+        assert sb.check_commit(Commit(0x0, NOP))
+        assert (sb.matches, sb.mismatches) == (1, 0)
+
+    def test_check_commit_pc_mismatch(self):
+        """Test a commit at the wrong PC is recorded as a mismatch."""
+        sb = CPUScoreboard(RV32IModel())
+        assert not sb.check_commit(Commit(0x4, NOP))
+        assert (sb.matches, sb.mismatches) == (0, 1)
+        assert sb.errors[0].startswith("PC mismatch")
+
+    def test_check_commit_dict(self):
+        """Test the legacy dict form is still accepted."""
+        sb = CPUScoreboard(RV32IModel())
+        assert sb.check_commit({"pc": 0x0, "insn": NOP})
+        assert sb.matches == 1
+
+    def test_check_commit_rd_value(self):
+        """Test rd/rd_value are compared when the commit carries them."""
+        sb = CPUScoreboard(RV32IModel())
+        assert sb.check_commit(Commit(0x0, ADDI_X1_5, rd=1, rd_value=5))
+
+        sb = CPUScoreboard(RV32IModel())
+        assert not sb.check_commit(Commit(0x0, ADDI_X1_5, rd=1, rd_value=6))
+        assert sb.errors[0].startswith("Register value mismatch")
+
+    def test_batch_match(self):
+        """Test a batch of matching commits."""
+        sb = CPUScoreboard(RV32IModel())
+        assert sb.check_commits(nop_commits(8))
+        assert (sb.matches, sb.mismatches) == (8, 0)
+        assert not sb.errors
+
+    def test_batch_equivalent_to_single(self):
+        """Test batch and per-commit checking agree on the same commits."""
+        commits = nop_commits(3) + [Commit(0xC, ADDI_X1_5, rd=1, rd_value=5)]
+        commits += nop_commits(2, start_pc=0x14)  # 0x10 skipped: mismatch
+
+        batch = CPUScoreboard(RV32IModel())
+        single = CPUScoreboard(RV32IModel())
+        assert not batch.check_commits(commits)
+        for commit in commits:
+            single.check_commit(commit)
+
+        assert (batch.matches, batch.mismatches) == (
+            single.matches,
+            single.mismatches,
+        )
+        assert batch.errors == single.errors
+
+    def test_batch_first_mismatch_index(self):
+        """Test history records the index of the first mismatching commit."""
+        sb = CPUScoreboard(RV32IModel(), record_history=True)
+        commits = nop_commits(3)
+        commits[2] = Commit(0x20, NOP)  # Model expects PC 0x8
+
+        assert not sb.check_commits(commits)
+        assert len(sb.history) == 3
+        assert list(sb.history.mismatches) == [2]
+        assert sb.history.pc[2] == 0x20
+        assert sb.errors == ["PC mismatch: RTL=0x00000020, Model=0x00000008"]
+
+    def test_error_cap(self):
+        """Test only the first MAX_ERRORS messages are kept."""
+        sb = CPUScoreboard(RV32IModel())
+        count = CPUScoreboard.MAX_ERRORS + 5
+        # The model's PC never reaches 0xFFFFF000, so every commit mismatches
+        commits = [Commit(0xFFFFF000, NOP) for _ in range(count)]
+
+        assert not sb.check_commits(commits)
+        assert sb.mismatches == count
+        assert len(sb.errors) == CPUScoreboard.MAX_ERRORS
+
+    def test_debug_log_guard(self, caplog):
+        """Test per-commit match messages are only logged at DEBUG."""
+        log = logging.getLogger("test_scoreboard")
+        sb = CPUScoreboard(RV32IModel(), log=log)
+
+        with caplog.at_level(logging.INFO, logger="test_scoreboard"):
+            sb.check_commit(Commit(0x0, NOP))
+        assert not any("Commit matched" in r.message for r in caplog.records)
+
+        with caplog.at_level(logging.DEBUG, logger="test_scoreboard"):
+            sb.check_commit(Commit(0x4, NOP))
+        assert any("Commit matched" in r.message for r in caplog.records)
+
+    def test_report(self):
+        """Test report() reflects whether any commit mismatched."""
+        sb = CPUScoreboard(RV32IModel())
+        sb.check_commits(nop_commits(2))
+        assert sb.report()
+
+        sb.check_commit(Commit(0x0, NOP))
+        assert not sb.report()